@@ -139,11 +139,19 @@ class FaceEngine:
         # Track faces if tracker is enabled
         if self.face_tracker and config.AUTO_SAVE_DETECTED_FACES and bgr_frame is not None:
             for i, (face_location, face_encoding) in enumerate(zip(face_locations, face_encodings)):
-                person_id, is_new = self.face_tracker.track_face(
-                    bgr_frame,
-                    face_encoding,
-                    face_location
-                )
+                # Cast once to the tracker's float32 layout; the casts inside
+                # check_duplicate() and register_new() are then no-ops
+                face_encoding = np.ascontiguousarray(face_encoding, dtype=np.float32)
+                
+                # Known faces only need the encoding; the frame is only
+                # handed over for faces that may still need saving
+                person_id = self.face_tracker.check_duplicate(face_encoding, face_location)
+                if person_id is None:
+                    person_id, is_new = self.face_tracker.register_new(
+                        bgr_frame,
+                        face_encoding,
+                        face_location
+                    )
                 # Handle None when collecting frames for quality check
                 tracked_ids.append(person_id if person_id is not None else "")
         else:
@@ -4,7 +4,7 @@ Measures face sharpness to ensure only clear images are saved.
 """
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 
 class FaceQualityDetector:
@@ -15,6 +15,10 @@ class FaceQualityDetector:
     BALANCED_THRESHOLD = 100.0    # Good quality (recommended)
     LENIENT_THRESHOLD = 50.0      # Accept slightly soft
     
+    # Crops whose subsampled intensity range is below this are near-uniform
+    # (heavy motion blur / out of focus) and are scored 0 without filtering
+    FLAT_RANGE_THRESHOLD = 20
+    
     def __init__(self, threshold: float = BALANCED_THRESHOLD):
         """
         Initialize quality detector.
@@ -45,6 +49,11 @@ class FaceQualityDetector:
         else:
             gray = image
         
+        # Cheap pre-check on a 1/64 subsample: a flat crop is trivially blurry
+        sub = gray[::8, ::8]
+        if sub.size and int(sub.max()) - int(sub.min()) < self.FLAT_RANGE_THRESHOLD:
+            return 0.0
+        
         # Calculate Laplacian variance
         laplacian = cv2.Laplacian(gray, cv2.CV_64F)
         variance = laplacian.var()
@@ -140,6 +149,11 @@ class MultiFrameCollector:
         # Storage for pending collections
         self.pending_collections = {}  # {person_hash: [frames, encodings, locations]}
         
+        # First encoding of each pending collection, stacked for one
+        # vectorized distance scan, with the matching hashes in row order
+        self._pending_first = np.empty((0, 128), dtype=np.float32)
+        self._pending_hashes: List[str] = []
+        
         print(f"Multi-Frame Collector initialized")
         print(f"Frames to collect: {self.num_frames}")
     
@@ -176,16 +190,21 @@ class MultiFrameCollector:
         Returns:
             True if collection is complete
         """
-        if person_hash not in self.pending_collections:
+        collection = self.pending_collections.get(person_hash)
+        if collection is None:
             return False
         
-        collection = self.pending_collections[person_hash]
+        if collection['count'] == 0:
+            self._pending_first = np.vstack([self._pending_first, encoding])
+            self._pending_hashes.append(person_hash)
+        
         collection['frames'].append(frame.copy())
         collection['encodings'].append(encoding.copy())
         collection['locations'].append(location)
-        collection['count'] += 1
+        count = collection['count'] + 1
+        collection['count'] = count
         
-        return collection['count'] >= self.num_frames
+        return count >= self.num_frames
     
     def get_best_frame(self, person_hash: str) -> Tuple[np.ndarray, np.ndarray, Tuple, float]:
         """
@@ -215,9 +234,37 @@ class MultiFrameCollector:
         
         # Clean up
         del self.pending_collections[person_hash]
+        self._remove_pending_first(person_hash)
         
         return best_frame, best_encoding, best_location, sharpness
     
+    def _remove_pending_first(self, person_hash: str) -> None:
+        """Drop a finished collection from the first-encoding matrix."""
+        if person_hash in self._pending_hashes:
+            idx = self._pending_hashes.index(person_hash)
+            self._pending_first = np.delete(self._pending_first, idx, axis=0)
+            del self._pending_hashes[idx]
+    
+    def find_collection(self, encoding: np.ndarray, threshold: float) -> Optional[str]:
+        """
+        Find the pending collection whose first frame matches an encoding.
+        
+        Args:
+            encoding: Face encoding to match
+            threshold: Maximum face distance to count as the same person
+        
+        Returns:
+            Hash of the closest matching collection, or None
+        """
+        if not self._pending_hashes:
+            return None
+        
+        distances = np.linalg.norm(self._pending_first - encoding, axis=1)
+        idx = int(np.argmin(distances))
+        if distances[idx] <= threshold:
+            return self._pending_hashes[idx]
+        return None
+    
     def is_collecting(self, person_hash: str) -> bool:
         """Check if still collecting frames for a person."""
         return person_hash in self.pending_collections
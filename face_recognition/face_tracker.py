@@ -3,10 +3,15 @@ Face tracker for detecting and tracking unique individuals.
 Prevents duplicate saves by comparing face encodings.
 """
 import os
-import json
+import atexit
+import base64
 import hashlib
+import queue
+import threading
 import time
 import numpy as np
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Tuple, List
 import face_recognition
@@ -14,15 +19,23 @@ import cv2
 import config
 from face_quality import FaceQualityDetector, MultiFrameCollector
 
+# Encoder params for saved face crops. Pinned explicitly because older
+# OpenCV builds default to zlib level 3, which is ~1.5x slower to encode.
+PNG_WRITE_PARAMS = [int(cv2.IMWRITE_PNG_COMPRESSION), config.SAVED_FACE_PNG_COMPRESSION]
+
 
 class FaceTracker:
     """Tracks detected faces and prevents duplicate saves."""
     
+    # Initial number of rows preallocated for tracked encodings
+    INITIAL_ENCODING_CAPACITY = 16
+    
     def __init__(
         self,
         detected_faces_dir: str = config.DETECTED_FACES_DIR,
         registry_file: str = config.FACE_REGISTRY_FILE,
-        duplicate_threshold: float = config.DUPLICATE_THRESHOLD
+        duplicate_threshold: float = config.DUPLICATE_THRESHOLD,
+        registry_meta_file: str = config.FACE_REGISTRY_META_FILE
     ):
         """
         Initialize the face tracker.
@@ -31,21 +44,48 @@ class FaceTracker:
             detected_faces_dir: Directory to save detected face images
             registry_file: Path to JSON registry file
             duplicate_threshold: Face distance threshold for duplicates
+            registry_meta_file: Path to the registry metadata file (next_person_id)
         """
         self.detected_faces_dir = detected_faces_dir
         self.registry_file = registry_file
+        self.registry_meta_file = registry_meta_file
         self.duplicate_threshold = duplicate_threshold
         
+        # For unit vectors ||a - b||^2 = 2 - 2 a.b, so "distance <= threshold"
+        # is the same as "similarity >= 1 - threshold^2 / 2"
+        self._sim_threshold = 1.0 - (duplicate_threshold ** 2) / 2.0
+        
         # In-memory registry of tracked faces
         self.registry: Dict = {}
         
-        # Lists for fast encoding comparison
-        self.tracked_encodings: List = []
+        # L2-normalized float32 encodings (first _n rows, grown by doubling)
+        # and the matching person IDs, for fast encoding comparison
+        self._enc_matrix = np.empty((self.INITIAL_ENCODING_CAPACITY, 128), dtype=np.float32)
+        self._n = 0
         self.tracked_ids: List[str] = []
         
+        # Scratch buffers reused by every _is_duplicate call (no temporaries)
+        self._query = np.empty(128, dtype=np.float32)
+        self._sims = np.empty(self.INITIAL_ENCODING_CAPACITY, dtype=np.float32)
+        
+        # Optional FAISS HNSW index, built once the registry is large enough
+        self._ann_index = None
+        self._ann_available = config.ENABLE_ANN_INDEX
+        
         # Counter for new person IDs
         self.next_person_id = 1
         
+        # Running sum of detection_count over the registry
+        self._total_detections = 0
+        
+        # Recent full encoding matches: [(face_location, person_id, time)].
+        # A box that overlaps one of these is the same person, no search needed.
+        self._last_matches: List[Tuple[Tuple[int, int, int, int], str, float]] = []
+        
+        # last_seen timestamp string, reformatted at most once per second
+        self._last_seen_sec = -1
+        self._last_seen_iso = ""
+        
         # Detection stability tracking - tracks faces across frames before saving
         self.detection_candidates = {}  # {temp_id: {'encoding': ..., 'count': N, 'last_seen': time}}
         self.detection_stability_threshold = config.DETECTION_STABILITY_FRAMES
@@ -64,16 +104,32 @@ class FaceTracker:
         
         # Initialize Supabase storage if enabled
         self.supabase_storage = None
+        self._upload_pool = None
         if config.ENABLE_SUPABASE_UPLOAD:
             try:
                 from supabase_storage import SupabaseStorage
                 self.supabase_storage = SupabaseStorage()
+                self._upload_pool = ThreadPoolExecutor(
+                    max_workers=config.SUPABASE_UPLOAD_WORKERS,
+                    thread_name_prefix="supabase-upload"
+                )
             except Exception as e:
                 print(f"⚠️  Failed to initialize Supabase: {e}")
         
         # Create directories
         os.makedirs(detected_faces_dir, exist_ok=True)
         os.makedirs(os.path.dirname(registry_file), exist_ok=True)
+        os.makedirs(os.path.dirname(registry_meta_file), exist_ok=True)
+        
+        # Background writer for face images and registry saves, so the
+        # detection loop never blocks on PNG encoding or disk I/O
+        self._registry_lock = threading.Lock()
+        self._registry_dirty = False
+        self._io_closed = False  # Set once the writer has stopped; saves then write directly
+        self._io_queue = queue.Queue()
+        self._io_thread = threading.Thread(target=self._io_worker, daemon=True)
+        self._io_thread.start()
+        atexit.register(self.close)
         
         # Load existing registry
         self._load_registry()
@@ -89,12 +145,18 @@ class FaceTracker:
             return
         
         try:
-            with open(self.registry_file, 'r') as f:
-                self.registry = json.load(f)
+            with open(self.registry_file, 'rb') as f:
+                self.registry = orjson.loads(f.read())
             
-            # Rebuild in-memory encoding lists from saved data
+            # Rebuild in-memory encodings from saved data
+            backfilled = False
             for person_id, data in self.registry.items():
-                # Load the saved face image to get encoding
+                if data.get('encoding_b64'):
+                    self._append_encoding(self._decode_encoding(data['encoding_b64']), person_id)
+                    continue
+                
+                # Older registries have no stored encoding: re-encode the
+                # saved face image once and store the result
                 image_path = os.path.join(
                     os.path.dirname(self.registry_file),
                     "..",
@@ -107,15 +169,22 @@ class FaceTracker:
                         encodings = face_recognition.face_encodings(image)
                         
                         if len(encodings) > 0:
-                            self.tracked_encodings.append(encodings[0])
-                            self.tracked_ids.append(person_id)
+                            self._append_encoding(encodings[0], person_id)
+                            data['encoding_b64'] = self._encode_encoding(encodings[0])
+                            backfilled = True
                     except Exception as e:
                         print(f"Warning: Could not load encoding for {person_id}: {e}")
             
-            # Update next_person_id counter
+            if backfilled:
+                self._save_registry()
+            
+            self._total_detections = sum(
+                data.get('detection_count', 0) for data in self.registry.values()
+            )
+            
+            # Restore next_person_id counter from the sidecar meta file
             if self.registry:
-                max_id = max([int(pid.split('_')[1]) for pid in self.registry.keys()])
-                self.next_person_id = max_id + 1
+                self.next_person_id = self._load_registry_meta()
             
             print(f"Loaded {len(self.registry)} tracked faces from registry")
             print(f"Next person ID: {self.next_person_id}")
@@ -124,14 +193,203 @@ class FaceTracker:
             print(f"Error loading registry: {e}")
             self.registry = {}
     
+    def _load_registry_meta(self) -> int:
+        """
+        Read the next person ID from the registry meta file.
+        
+        Registries written before the meta file existed fall back to
+        parsing the numeric suffix of the stored person IDs once.
+        
+        Returns:
+            Next person ID number
+        """
+        try:
+            with open(self.registry_meta_file, 'rb') as f:
+                return int(orjson.loads(f.read())['next_person_id'])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read registry meta: {e}")
+        
+        max_id = 0
+        for pid in self.registry:
+            suffix = pid.rpartition('_')[2]
+            if suffix.isdigit():
+                max_id = max(max_id, int(suffix))
+        return max_id + 1
+    
     def _save_registry(self) -> None:
-        """Save registry to JSON file."""
+        """
+        Mark the registry dirty and schedule a save on the background writer,
+        or write it directly once the writer has been stopped by close().
+        """
+        with self._registry_lock:
+            write_now = self._io_closed
+            if not write_now:
+                if self._registry_dirty:
+                    return  # A save is already scheduled
+                self._registry_dirty = True
+        if write_now:
+            self._write_registry()
+            return
+        self._io_queue.put(('registry', None))
+    
+    def _write_registry(self) -> None:
+        """Write registry to JSON file atomically (runs on the writer thread)."""
         try:
-            with open(self.registry_file, 'w') as f:
-                json.dump(self.registry, f, indent=2)
+            with self._registry_lock:
+                self._registry_dirty = False
+                data = orjson.dumps(
+                    self.registry,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                )
+                meta = orjson.dumps(
+                    {'next_person_id': self.next_person_id},
+                    option=orjson.OPT_INDENT_2
+                )
+            # Meta first: if interrupted, the counter is ahead, never behind
+            for path, payload in ((self.registry_meta_file, meta), (self.registry_file, data)):
+                tmp_path = path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
         except Exception as e:
             print(f"Error saving registry: {e}")
     
+    def _save_face_image(self, person_id: str, image_filename: str, face_crop: np.ndarray) -> None:
+        """
+        Queue a face crop to be written to disk (and uploaded, if enabled),
+        or write it directly once the writer has been stopped by close().
+        
+        Args:
+            person_id: Person ID the image belongs to
+            image_filename: Filename inside detected_faces_dir
+            face_crop: Face image (BGR). Must not be modified after queuing.
+        """
+        with self._registry_lock:
+            write_now = self._io_closed
+        if write_now:
+            self._write_face_image(person_id, image_filename, face_crop)
+            return
+        self._io_queue.put(('image', (person_id, image_filename, face_crop)))
+    
+    def _write_face_image(self, person_id: str, image_filename: str, face_crop: np.ndarray) -> None:
+        """Write a face crop and upload it to Supabase (on the writer thread, or inline after close())."""
+        image_path = os.path.join(self.detected_faces_dir, image_filename)
+        
+        # Encode once; the same PNG bytes go to disk and to Supabase
+        ok, buf = cv2.imencode('.png', face_crop, PNG_WRITE_PARAMS)
+        if not ok:
+            print(f"Error encoding face image: {image_filename}")
+            return
+        png_data = buf.tobytes()
+        with open(image_path, 'wb') as f:
+            f.write(png_data)
+        
+        # Upload to Supabase in the background if enabled
+        if self._upload_pool:
+            storage_path = f"faces/{image_filename}"
+            future = self._upload_pool.submit(
+                self.supabase_storage.upload_face_image,
+                image_path, storage_path, png_data
+            )
+            future.add_done_callback(
+                lambda f, pid=person_id: self._on_upload(pid, f)
+            )
+    
+    def _on_upload(self, person_id: str, future: Future) -> None:
+        """
+        Record the Supabase URL once an upload finishes (runs on an upload thread).
+        
+        Args:
+            person_id: Person ID the uploaded image belongs to
+            future: Completed upload_face_image future
+        """
+        try:
+            upload_result = future.result()
+        except Exception as e:
+            print(f"❌ Failed to upload to Supabase: {e}")
+            return
+        
+        if upload_result and upload_result.get('success'):
+            supabase_url = upload_result.get('public_url')
+            with self._registry_lock:
+                entry = self.registry.get(person_id)
+                if entry is not None:
+                    entry['supabase_url'] = supabase_url
+            if entry is not None:
+                self._save_registry()
+            print(f"   Supabase URL: {supabase_url}")
+    
+    def _io_worker(self) -> None:
+        """
+        Process queued image writes and registry saves.
+        
+        Registry saves are coalesced: the registry is written at most once
+        per REGISTRY_SAVE_INTERVAL seconds, and on shutdown if still dirty.
+        """
+        while True:
+            kind, payload = self._io_queue.get()
+            save_registry = False
+            deadline = None
+            
+            while kind != 'stop':
+                if kind == 'image':
+                    try:
+                        self._write_face_image(*payload)
+                    except Exception as e:
+                        print(f"Error saving face image: {e}")
+                else:
+                    save_registry = True
+                    if deadline is None:
+                        deadline = time.time() + config.REGISTRY_SAVE_INTERVAL
+                
+                # Drain whatever else is queued before writing the registry
+                try:
+                    if deadline is None:
+                        kind, payload = self._io_queue.get_nowait()
+                    else:
+                        kind, payload = self._io_queue.get(
+                            timeout=max(0.0, deadline - time.time())
+                        )
+                except queue.Empty:
+                    break
+            
+            if save_registry:
+                self._write_registry()
+            if kind == 'stop':
+                return
+    
+    def close(self) -> None:
+        """Flush pending image writes, uploads and registry saves, then stop the workers."""
+        if self._io_thread.is_alive():
+            self._io_queue.put(('stop', None))
+            self._io_thread.join()
+        
+        # From here on saves (e.g. from upload callbacks) are written directly
+        with self._registry_lock:
+            self._io_closed = True
+        
+        # Images queued after the writer stopped would otherwise never be written
+        while True:
+            try:
+                kind, payload = self._io_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'image':
+                self._write_face_image(*payload)
+        
+        if self._upload_pool:
+            self._upload_pool.shutdown(wait=True)
+            self._upload_pool = None
+        
+        # A save scheduled after the writer drained its queue is still pending
+        if self._registry_dirty:
+            self._write_registry()
+        
+        # Don't keep this tracker alive until interpreter exit
+        atexit.unregister(self.close)
+    
     def _generate_person_id(self) -> str:
         """
         Generate next person ID.
@@ -151,11 +409,95 @@ class FaceTracker:
             encoding: Face encoding array
         
         Returns:
-            SHA256 hash of the encoding
+            16-character BLAKE2b hash of the encoding
         """
-        # Convert encoding to bytes and hash
+        # Only used as an identifier, so a short non-SHA digest is plenty
         encoding_bytes = encoding.tobytes()
-        return hashlib.sha256(encoding_bytes).hexdigest()[:16]
+        return hashlib.blake2b(encoding_bytes, digest_size=8).hexdigest()
+    
+    @staticmethod
+    def _encode_encoding(encoding: np.ndarray) -> str:
+        """
+        Serialize a face encoding for the JSON registry.
+        
+        Args:
+            encoding: Face encoding array
+        
+        Returns:
+            Base64 string of the float32 encoding bytes
+        """
+        return base64.b64encode(np.asarray(encoding, dtype=np.float32).tobytes()).decode('ascii')
+    
+    @staticmethod
+    def _decode_encoding(encoded: str) -> np.ndarray:
+        """
+        Deserialize a face encoding stored by _encode_encoding.
+        
+        Args:
+            encoded: Base64 string from the registry
+        
+        Returns:
+            Float32 face encoding array
+        """
+        return np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+    
+    @staticmethod
+    def _normalize_encoding(encoding: np.ndarray) -> np.ndarray:
+        """
+        Convert a face encoding to an L2-normalized float32 vector.
+        
+        Args:
+            encoding: Face encoding array
+        
+        Returns:
+            Unit-length float32 copy of the encoding
+        """
+        encoding = np.asarray(encoding, dtype=np.float32)
+        return encoding / np.linalg.norm(encoding)
+    
+    def _append_encoding(self, encoding: np.ndarray, person_id: str) -> None:
+        """
+        Add a tracked face encoding for duplicate checks.
+        
+        Args:
+            encoding: Face encoding from face_recognition
+            person_id: Person ID the encoding belongs to
+        """
+        if self._n == len(self._enc_matrix):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.empty((2 * len(self._enc_matrix), 128), dtype=np.float32)
+            grown[:self._n] = self._enc_matrix[:self._n]
+            self._enc_matrix = grown
+            self._sims = np.empty(len(grown), dtype=np.float32)
+        
+        self._enc_matrix[self._n] = self._normalize_encoding(encoding)
+        if self._ann_index is not None:
+            self._ann_index.add(self._enc_matrix[self._n:self._n + 1])
+        self._n += 1
+        self.tracked_ids.append(person_id)
+        
+        if self._ann_index is None and self._ann_available and \
+                self._n >= config.ANN_INDEX_MIN_FACES:
+            self._build_ann_index()
+    
+    def _build_ann_index(self) -> None:
+        """
+        Build an HNSW index over the tracked encodings.
+        
+        Rows are unit length, so inner-product search ranks exactly like L2
+        and returns similarities comparable to _sim_threshold.
+        """
+        try:
+            import faiss
+        except ImportError:
+            print("⚠️  faiss not installed - using brute-force duplicate matching")
+            self._ann_available = False
+            return
+        
+        index = faiss.IndexHNSWFlat(128, 32, faiss.METRIC_INNER_PRODUCT)
+        index.add(self._enc_matrix[:self._n])
+        self._ann_index = index
+        print(f"Built HNSW index over {self._n} tracked faces")
     
     def _is_duplicate(self, encoding: np.ndarray) -> Tuple[bool, Optional[str]]:
         """
@@ -167,31 +509,127 @@ class FaceTracker:
         Returns:
             Tuple of (is_duplicate, person_id)
         """
-        if len(self.tracked_encodings) == 0:
+        n, ids, sim_threshold = self._n, self.tracked_ids, self._sim_threshold
+        if n == 0:
             return False, None
         
-        # Calculate distances to all tracked encodings
-        distances = face_recognition.face_distance(
-            self.tracked_encodings,
-            encoding
-        )
-        
-        # Find closest match
-        min_distance_idx = np.argmin(distances)
-        min_distance = distances[min_distance_idx]
-        
-        # Debug: Print distance information
-        print(f"🔍 Face comparison: Closest match distance = {min_distance:.3f} (threshold: {self.duplicate_threshold})")
+        # Normalize the query into the scratch buffer
+        query = self._query
+        np.multiply(encoding, 1.0 / np.linalg.norm(encoding), out=query, casting='unsafe')
         
-        # Check if below threshold (is a duplicate)
-        if min_distance <= self.duplicate_threshold:
-            person_id = self.tracked_ids[min_distance_idx]
-            print(f"   ✅ Matched existing person: {person_id}")
+        if self._ann_index is not None:
+            # Large registry: approximate nearest neighbour, O(log N)
+            best_sims, best_ids = self._ann_index.search(query.reshape(1, 128), 1)
+            best_idx = int(best_ids[0, 0])
+            best_sim = float(best_sims[0, 0])
+        else:
+            # Cosine similarity to all tracked encodings from a single matvec
+            sims = self._sims[:n]
+            np.dot(self._enc_matrix[:n], query, out=sims)
+            
+            # Find closest match (highest similarity)
+            best_idx = int(sims.argmax())
+            best_sim = float(sims[best_idx])
+        
+        # Debug: Print distance information (runs per face per frame, so opt-in)
+        debug = config.DEBUG_FACE_MATCHING
+        if debug:
+            min_distance = max(0.0, 2.0 - 2.0 * best_sim) ** 0.5
+            print(f"🔍 Face comparison: Closest match distance = {min_distance:.3f} (threshold: {self.duplicate_threshold})")
+        
+        # Check if above similarity threshold (is a duplicate)
+        if best_sim >= sim_threshold:
+            person_id = ids[best_idx]
+            if debug:
+                print(f"   ✅ Matched existing person: {person_id}")
             return True, person_id
         
-        print(f"   🆕 New unique face detected")
+        if debug:
+            print(f"   🆕 New unique face detected")
         return False, None
     
+    @staticmethod
+    def _location_iou(
+        a: Tuple[int, int, int, int],
+        b: Tuple[int, int, int, int]
+    ) -> float:
+        """
+        Intersection-over-union of two face boxes.
+        
+        Args:
+            a, b: Face bounding boxes (top, right, bottom, left)
+        
+        Returns:
+            IoU in [0, 1]
+        """
+        inter_h = min(a[2], b[2]) - max(a[0], b[0])
+        inter_w = min(a[1], b[1]) - max(a[3], b[3])
+        if inter_h <= 0 or inter_w <= 0:
+            return 0.0
+        
+        inter = inter_h * inter_w
+        area_a = (a[2] - a[0]) * (a[1] - a[3])
+        area_b = (b[2] - b[0]) * (b[1] - b[3])
+        return inter / float(area_a + area_b - inter)
+    
+    def _match_recent_location(self, face_location: Tuple[int, int, int, int]) -> Optional[str]:
+        """
+        Find a recent encoding match whose box overlaps this face.
+        
+        Entries expire IOU_GATE_MAX_AGE seconds after their encoding match
+        (gated hits do not refresh them), so a lingering face is re-verified
+        by encoding at least that often.
+        
+        Args:
+            face_location: Face bounding box (top, right, bottom, left)
+        
+        Returns:
+            Person ID of the overlapping match, or None
+        """
+        if not self._last_matches:
+            return None
+        
+        now = time.time()
+        self._last_matches = [
+            m for m in self._last_matches
+            if now - m[2] <= config.IOU_GATE_MAX_AGE and m[1] in self.registry
+        ]
+        
+        for location, person_id, _ in self._last_matches:
+            if self._location_iou(location, face_location) >= config.IOU_GATE_THRESHOLD:
+                return person_id
+        return None
+    
+    def _now_iso(self) -> str:
+        """
+        Current time as an ISO string, cached for the rest of the second.
+        
+        Returns:
+            ISO-formatted timestamp (second resolution is enough for last_seen)
+        """
+        now = time.time()
+        sec = int(now)
+        if sec != self._last_seen_sec:
+            self._last_seen_sec = sec
+            self._last_seen_iso = datetime.fromtimestamp(now).isoformat()
+        return self._last_seen_iso
+    
+    def _record_detection(self, person_id: str) -> None:
+        """
+        Update an existing person's registry entry for a new detection.
+        
+        Args:
+            person_id: Person ID that was detected
+        """
+        entry = self.registry[person_id]
+        entry['detection_count'] += 1
+        self._total_detections += 1
+        entry['last_seen'] = self._now_iso()
+        
+        # Save registry periodically (every 10 detections)
+        if entry['detection_count'] % 10 == 0:
+            self._save_registry()
+    
     def _check_detection_candidate(self, encoding: np.ndarray) -> Optional[str]:
         """
         Check if this face matches an existing detection candidate.
@@ -255,8 +693,11 @@ class FaceTracker:
         """
         Track a detected face. Only save if stable across multiple frames.
         
+        Convenience wrapper around check_duplicate() and register_new().
+        
         Args:
-            face_image: Full frame image (BGR format)
+            face_image: Full frame image (BGR uint8, as captured; only cropped
+                if the face ends up being saved)
             face_encoding: Face encoding from face_recognition
             face_location: Face bounding box (top, right, bottom, left)
         
@@ -264,20 +705,75 @@ class FaceTracker:
             Tuple of (person_id, is_new_face)
             person_id is None if still collecting stability/quality frames
         """
-        # First check if already tracked (existing person)
-        is_duplicate, existing_id = self._is_duplicate(face_encoding)
+        # Cast once to the float32 layout every comparison and store uses,
+        # instead of each one promoting the float64 encoding separately
+        face_encoding = np.ascontiguousarray(face_encoding, dtype=np.float32)
         
-        if is_duplicate:
-            # Update existing person
-            self.registry[existing_id]['detection_count'] += 1
-            self.registry[existing_id]['last_seen'] = datetime.now().isoformat()
-            
-            # Save registry periodically (every 10 detections)
-            if self.registry[existing_id]['detection_count'] % 10 == 0:
-                self._save_registry()
-            
+        existing_id = self.check_duplicate(face_encoding, face_location)
+        if existing_id is not None:
             return existing_id, False
         
+        return self.register_new(face_image, face_encoding, face_location)
+    
+    def check_duplicate(
+        self,
+        face_encoding: np.ndarray,
+        face_location: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[str]:
+        """
+        Look up an already tracked person and record the detection (fast path).
+        
+        Needs no frame, so callers can skip touching the image entirely
+        for known faces.
+        
+        Args:
+            face_encoding: Face encoding from face_recognition (pass float32
+                to avoid a per-call cast)
+            face_location: Face bounding box (top, right, bottom, left), used
+                to reuse a recent match for an overlapping box
+        
+        Returns:
+            Person ID if the face is already tracked, None otherwise
+        """
+        # Temporally stable face: same box as a recent match, skip the search
+        if face_location is not None:
+            gated_id = self._match_recent_location(face_location)
+            if gated_id is not None:
+                self._record_detection(gated_id)
+                return gated_id
+        
+        face_encoding = np.ascontiguousarray(face_encoding, dtype=np.float32)
+        is_duplicate, existing_id = self._is_duplicate(face_encoding)
+        
+        if not is_duplicate:
+            return None
+        
+        if face_location is not None:
+            self._last_matches.append((face_location, existing_id, time.time()))
+        self._record_detection(existing_id)
+        return existing_id
+    
+    def register_new(
+        self,
+        face_image: np.ndarray,
+        face_encoding: np.ndarray,
+        face_location: Tuple[int, int, int, int]
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Advance a face that check_duplicate() did not match towards being saved.
+        
+        Args:
+            face_image: Full frame image (BGR uint8)
+            face_encoding: Face encoding from face_recognition (pass float32
+                to avoid a per-call cast)
+            face_location: Face bounding box (top, right, bottom, left)
+        
+        Returns:
+            Tuple of (person_id, is_new_face)
+            person_id is None if still collecting stability/quality frames
+        """
+        face_encoding = np.ascontiguousarray(face_encoding, dtype=np.float32)
+        
         # Check detection candidates (potentially new person)
         candidate_id = self._check_detection_candidate(face_encoding)
         
@@ -330,43 +826,36 @@ class FaceTracker:
         
         # Save face image with timestamp in filename as PNG
         image_filename = f"{person_id}_{timestamp}.png"
-        image_path = os.path.join(self.detected_faces_dir, image_filename)
-        cv2.imwrite(image_path, face_crop)
-        
-        # Upload to Supabase if enabled
-        supabase_url = None
-        if self.supabase_storage:
-            storage_path = f"faces/{image_filename}"
-            upload_result = self.supabase_storage.upload_face_image(image_path, storage_path)
-            if upload_result and upload_result.get('success'):
-                supabase_url = upload_result.get('public_url')
         
         # Add to in-memory tracking
-        self.tracked_encodings.append(face_encoding)
-        self.tracked_ids.append(person_id)
+        self._append_encoding(face_encoding, person_id)
         
         # Add to registry
         now = datetime.now().isoformat()
-        self.registry[person_id] = {
+        entry = {
             'id': person_id,
             'first_seen': now,
             'last_seen': now,
             'image_path': f"detected_faces/{image_filename}",
             'image_filename': image_filename,
             'timestamp': timestamp,
-            'supabase_url': supabase_url,
+            'supabase_url': None,  # Filled in by the writer after upload
             'encoding_hash': self._encoding_to_hash(face_encoding),
+            'encoding_b64': self._encode_encoding(face_encoding),
             'detection_count': 1,
             'person_info': None,  # Will be populated by API call
             'api_called': False  # Flag to track if API has been called
         }
+        with self._registry_lock:
+            self.registry[person_id] = entry
+        self._total_detections += 1
         
-        # Save registry
+        # Write image and registry in the background. The crop is a view
+        # into the live frame, so copy it before handing it off.
+        self._save_face_image(person_id, image_filename, face_crop.copy())
         self._save_registry()
         
         print(f"New face detected and saved: {person_id} ({image_filename})")
-        if supabase_url:
-            print(f"   Supabase URL: {supabase_url}")
         
         return person_id, True
     
@@ -389,19 +878,11 @@ class FaceTracker:
             person_id is None if still collecting
         """
         # Check if we're already collecting frames for this person
-        # by comparing face encodings with pending collections
-        collection_hash = None
-        
-        for pending_hash, collection_data in self.frame_collector.pending_collections.items():
-            if collection_data['encodings']:
-                # Compare with the first encoding in the collection
-                first_encoding = collection_data['encodings'][0]
-                distance = face_recognition.face_distance([first_encoding], face_encoding)[0]
-                
-                # If similar enough, this is the same person
-                if distance <= self.duplicate_threshold:
-                    collection_hash = pending_hash
-                    break
+        # by comparing with the first encoding of each pending collection
+        collection_hash = self.frame_collector.find_collection(
+            face_encoding,
+            self.duplicate_threshold
+        )
         
         # If no matching collection found, start a new one
         if collection_hash is None:
@@ -449,24 +930,13 @@ class FaceTracker:
         
         # Save face image with timestamp in filename as PNG
         image_filename = f"{person_id}_{timestamp}.png"
-        image_path = os.path.join(self.detected_faces_dir, image_filename)
-        cv2.imwrite(image_path, best_face)
-        
-        # Upload to Supabase if enabled
-        supabase_url = None
-        if self.supabase_storage:
-            storage_path = f"faces/{image_filename}"
-            upload_result = self.supabase_storage.upload_face_image(image_path, storage_path)
-            if upload_result and upload_result.get('success'):
-                supabase_url = upload_result.get('public_url')
         
         # Add to in-memory tracking
-        self.tracked_encodings.append(best_encoding)
-        self.tracked_ids.append(person_id)
+        self._append_encoding(best_encoding, person_id)
         
         # Add to registry
         now = datetime.now().isoformat()
-        self.registry[person_id] = {
+        entry = {
             'id': person_id,
             'first_seen': now,
             'last_seen': now,
@@ -475,24 +945,28 @@ class FaceTracker:
             'timestamp': timestamp,
             'sharpness_score': sharpness,
             'quality_rating': quality_rating,
-            'supabase_url': supabase_url,
+            'supabase_url': None,  # Filled in by the writer after upload
             'encoding_hash': self._encoding_to_hash(best_encoding),
+            'encoding_b64': self._encode_encoding(best_encoding),
             'detection_count': 1,
             'person_info': None,
             'api_called': False
         }
+        with self._registry_lock:
+            self.registry[person_id] = entry
+        self._total_detections += 1
         
-        # Save registry
+        # Write image and registry in the background (best_face is already
+        # a private copy held by the frame collector)
+        self._save_face_image(person_id, image_filename, best_face)
         self._save_registry()
         
         print(f"New face detected and saved: {person_id} ({image_filename})")
-        if supabase_url:
-            print(f"   Supabase URL: {supabase_url}")
         
         return person_id, True
     
+    @staticmethod
     def _crop_face_with_padding(
-        self,
         image: np.ndarray,
         top: int,
         right: int,
@@ -509,16 +983,20 @@ class FaceTracker:
             padding: Pixels to add around face
         
         Returns:
-            Cropped face image
+            Cropped face image (a view into image, not a copy)
         """
-        # Add padding
+        # Add padding, clamped to the image (plain scalar compares are
+        # cheaper than max()/min() calls or a NumPy clip for four ints)
         height, width = image.shape[:2]
-        top = max(0, top - padding)
-        bottom = min(height, bottom + padding)
-        left = max(0, left - padding)
-        right = min(width, right + padding)
-        
-        return image[top:bottom, left:right]
+        top -= padding
+        bottom += padding
+        left -= padding
+        right += padding
+        
+        return image[
+            top if top > 0 else 0:bottom if bottom < height else height,
+            left if left > 0 else 0:right if right < width else width
+        ]
     
     def get_person_info(self, person_id: str) -> Optional[Dict]:
         """
@@ -596,22 +1074,24 @@ class FaceTracker:
         Returns:
             Dictionary with stats
         """
-        total_detections = sum(
-            data['detection_count'] for data in self.registry.values()
-        )
-        
         return {
             'total_unique_faces': len(self.registry),
-            'total_detections': total_detections,
-            'tracked_encodings': len(self.tracked_encodings)
+            'total_detections': self._total_detections,
+            'tracked_encodings': self._n
         }
     
     def reset(self) -> None:
         """Reset the tracker (clear all tracked faces)."""
-        self.registry = {}
-        self.tracked_encodings = []
+        with self._registry_lock:
+            self.registry = {}
+        self._enc_matrix = np.empty((self.INITIAL_ENCODING_CAPACITY, 128), dtype=np.float32)
+        self._sims = np.empty(self.INITIAL_ENCODING_CAPACITY, dtype=np.float32)
+        self._ann_index = None
+        self._last_matches = []
+        self._n = 0
         self.tracked_ids = []
         self.next_person_id = 1
+        self._total_detections = 0
         self._save_registry()
         print("Face tracker reset")
 
@@ -2,13 +2,243 @@
 Gesture detection module for recognizing hand gestures like snaps/clicks.
 Uses MediaPipe for hand tracking and custom logic for gesture detection.
 """
+import math
 import cv2
 import mediapipe as mp
 import numpy as np
+import queue
+import threading
 import time
+from collections import deque
+from itertools import chain
+from types import SimpleNamespace
 from typing import List, Tuple, Optional, Dict
 import config
 
+# Snap crossing angle window (20-90 degrees) as cosines, so the per-frame
+# test needs no arccos: angle in (20, 90) <=> cos in (cos 90, cos 20)
+SNAP_COS_MIN = math.cos(math.radians(90))
+SNAP_COS_MAX = math.cos(math.radians(20))
+
+# Peace sign criteria, in bit order of the mask built by _detect_peace_sign
+PEACE_CRITERIA = (
+    'index_extended',
+    'middle_extended',
+    'ring_folded',
+    'pinky_folded',
+    'thumb_not_up',
+    'fingers_spaced',
+    'index_upright',
+    'middle_upright',
+    'fingers_parallel',
+    'length_check'
+)
+
+
+def _snap_geometry(points: List[List[float]]) -> Tuple[float, float, float]:
+    """
+    Compute the snap measurements from landmark pixels using scalar math.
+    
+    Args:
+        points: 21 [x, y] landmark pixel coordinates as Python floats
+    
+    Returns:
+        Tuple of (thumb_index_distance, index_middle_distance, cos_angle)
+        where cos_angle is between the index finger and thumb vectors
+    """
+    # Thumb IP, thumb tip, index MCP, index tip, middle tip
+    x3, y3 = points[3]
+    x4, y4 = points[4]
+    x5, y5 = points[5]
+    x8, y8 = points[8]
+    x12, y12 = points[12]
+    
+    index_x, index_y = x8 - x5, y8 - y5
+    thumb_x, thumb_y = x4 - x3, y4 - y3
+    cos_angle = (index_x * thumb_x + index_y * thumb_y) / (
+        math.hypot(index_x, index_y) * math.hypot(thumb_x, thumb_y) + 1e-6
+    )
+    
+    return math.hypot(x4 - x8, y4 - y8), math.hypot(x8 - x12, y8 - y12), cos_angle
+
+
+class _TasksHands:
+    """
+    MediaPipe Tasks HandLandmarker exposed through the legacy Hands interface.
+    
+    Lets the Tasks API (and its GPU delegate) be used without changing the
+    rest of the detector: process() returns an object with the same
+    multi_hand_landmarks / multi_handedness fields as mp.solutions.hands.
+    
+    In live-stream mode process() does not block: the frame is submitted
+    with detect_async() and the latest result delivered by MediaPipe's
+    callback is returned, so no extra inference thread is needed.
+    """
+    
+    def __init__(
+        self,
+        model_path: str,
+        max_num_hands: int,
+        confidence: float,
+        use_gpu: bool,
+        live_stream: bool = False
+    ):
+        """
+        Create the hand landmarker, preferring the GPU delegate if requested.
+        
+        Args:
+            model_path: Path to a hand_landmarker.task model bundle
+            max_num_hands: Maximum number of hands to detect
+            confidence: Detection/presence/tracking confidence threshold
+            use_gpu: Try the GPU delegate before the CPU one
+            live_stream: Use LIVE_STREAM mode (asynchronous) instead of VIDEO
+        """
+        from mediapipe.tasks.python import BaseOptions, vision
+        
+        self.live_stream = live_stream
+        self._last_timestamp_ms = 0
+        self._latest_result = SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+        
+        if live_stream:
+            mode_options = {
+                'running_mode': vision.RunningMode.LIVE_STREAM,
+                'result_callback': self._on_result
+            }
+        else:
+            mode_options = {'running_mode': vision.RunningMode.VIDEO}
+        
+        delegates = [BaseOptions.Delegate.CPU]
+        if use_gpu:
+            delegates.insert(0, BaseOptions.Delegate.GPU)
+        
+        for delegate in delegates:
+            try:
+                options = vision.HandLandmarkerOptions(
+                    base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+                    num_hands=max_num_hands,
+                    min_hand_detection_confidence=confidence,
+                    min_hand_presence_confidence=confidence,
+                    min_tracking_confidence=confidence,
+                    **mode_options
+                )
+                self._landmarker = vision.HandLandmarker.create_from_options(options)
+                print(f"Hand landmarker using {delegate.name} delegate")
+                return
+            except Exception as e:
+                if delegate == delegates[-1]:
+                    raise
+                print(f"⚠️  {delegate.name} delegate unavailable ({e}), falling back")
+    
+    def process(self, rgb_frame: np.ndarray):
+        """
+        Detect hand landmarks in an RGB frame.
+        
+        Args:
+            rgb_frame: Contiguous RGB uint8 image
+        
+        Returns:
+            Result with multi_hand_landmarks and multi_handedness (None if no
+            hands). In live-stream mode this is the latest finished result.
+        """
+        # VIDEO and LIVE_STREAM modes need strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        if self.live_stream:
+            self._landmarker.detect_async(image, timestamp_ms)
+            return self._latest_result
+        
+        return self._convert_result(self._landmarker.detect_for_video(image, timestamp_ms))
+    
+    def _on_result(self, result, output_image, timestamp_ms: int) -> None:
+        """Store a live-stream result (called from MediaPipe's thread)."""
+        self._latest_result = self._convert_result(result)
+    
+    @staticmethod
+    def _convert_result(result) -> SimpleNamespace:
+        """
+        Convert a HandLandmarkerResult to the legacy Hands result shape.
+        
+        Args:
+            result: HandLandmarkerResult
+        
+        Returns:
+            Object with multi_hand_landmarks and multi_handedness
+        """
+        multi_hand_landmarks = None
+        multi_handedness = None
+        if result.hand_landmarks:
+            multi_hand_landmarks = [
+                SimpleNamespace(landmark=hand) for hand in result.hand_landmarks
+            ]
+            multi_handedness = [
+                SimpleNamespace(classification=[
+                    SimpleNamespace(label=categories[0].category_name)
+                ])
+                for categories in result.handedness
+            ]
+        
+        return SimpleNamespace(
+            multi_hand_landmarks=multi_hand_landmarks,
+            multi_handedness=multi_handedness
+        )
+    
+    def close(self):
+        """Release the landmarker."""
+        self._landmarker.close()
+
+
+# Hand tracking graph shared by all live GestureDetector instances. Loading
+# the models is the slow part of startup, so a detector created while another
+# one is alive reuses the graph; it is closed when the last detector closes.
+_shared_hands = None
+_shared_hands_refs = 0
+_shared_hands_lock = threading.Lock()
+# Serializes process() on the shared graph: each detector may call it from
+# its own inference thread, and MediaPipe graphs are not thread-safe
+_shared_hands_process_lock = threading.Lock()
+
+
+def _acquire_hands():
+    """
+    Get the shared hand tracking graph, creating it on first use.
+    
+    Returns:
+        MediaPipe Hands (or _TasksHands) instance
+    """
+    global _shared_hands, _shared_hands_refs
+    with _shared_hands_lock:
+        if _shared_hands is None:
+            # Tasks API when a model is configured, which can run on the GPU delegate
+            if config.GESTURE_LANDMARKER_MODEL:
+                _shared_hands = _TasksHands(
+                    config.GESTURE_LANDMARKER_MODEL,
+                    max_num_hands=config.GESTURE_MAX_HANDS,
+                    confidence=config.GESTURE_DETECTION_CONFIDENCE,
+                    use_gpu=config.GESTURE_USE_GPU,
+                    live_stream=config.GESTURE_ASYNC_INFERENCE
+                )
+            else:
+                _shared_hands = mp.solutions.hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=config.GESTURE_MAX_HANDS,
+                    min_detection_confidence=config.GESTURE_DETECTION_CONFIDENCE,
+                    min_tracking_confidence=config.GESTURE_DETECTION_CONFIDENCE
+                )
+        _shared_hands_refs += 1
+        return _shared_hands
+
+
+def _release_hands() -> None:
+    """Drop one reference to the shared graph, closing it with the last one."""
+    global _shared_hands, _shared_hands_refs
+    with _shared_hands_lock:
+        _shared_hands_refs -= 1
+        if _shared_hands_refs == 0:
+            _shared_hands.close()
+            _shared_hands = None
+
 
 class GestureEvent:
     """Represents a detected gesture event."""
@@ -38,15 +268,29 @@ class GestureDetector:
     
     def __init__(self):
         """Initialize the gesture detector."""
-        # Initialize MediaPipe Hands
+        # Initialize MediaPipe Hands (shared across detectors, see _acquire_hands).
+        # Frames go through _process(), which serializes calls on the shared graph.
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=config.GESTURE_DETECTION_CONFIDENCE,
-            min_tracking_confidence=config.GESTURE_DETECTION_CONFIDENCE
+        self.hands = _acquire_hands()
+        
+        # Landmark index pairs for drawing the hand skeleton, shape (N, 2)
+        self._hand_connections = np.array(
+            sorted(self.mp_hands.HAND_CONNECTIONS), dtype=np.int32
         )
-        self.mp_draw = mp.solutions.drawing_utils
+        
+        # Per-frame settings, read from config once
+        self._infer_width = config.GESTURE_INFER_WIDTH
+        self._motion_threshold = config.GESTURE_MOTION_THRESHOLD
+        self._motion_max_reuse = config.GESTURE_MOTION_MAX_REUSE
+        self._motion_reused = 0  # Frames reused by the motion gate since the last inference
+        self._frame_skip = max(1, config.GESTURE_FRAME_SKIP)
+        self._frame_counter = 0
+        self._cooldown_seconds = config.GESTURE_COOLDOWN_SECONDS
+        self._box_color = config.GESTURE_BOX_COLOR
+        self._box_thickness = config.GESTURE_BOX_THICKNESS
+        self._label_text = config.GESTURE_LABEL_TEXT
+        self._show_landmarks = config.SHOW_HAND_LANDMARKS
+        self._draw = config.GESTURE_DRAW
         
         # Tracking variables for gesture detection
         self.finger_distances = {}  # Track distance history per hand
@@ -55,6 +299,43 @@ class GestureDetector:
         self.gesture_states = {}  # Track current gesture state per hand
         self.peace_stability = {}  # Track peace sign stability over frames
         
+        # Reused (21, 2) buffer of landmark pixel coordinates for the current hand
+        self._landmark_px = np.empty((21, 2), dtype=np.float32)
+        self._px_scale = None  # (width, height) of the frame shape below
+        self._px_scale_shape = None
+        
+        # Optional background inference: a single-slot input queue (newest
+        # frame wins) and the latest finished result
+        self._infer_queue = None
+        self._infer_thread = None
+        self._latest_results = None
+        # Bumped for every new inference result; gesture state machines only
+        # advance when it changes, so a result reused across display frames
+        # can't count as several stable frames
+        self._results_seq = 0
+        self._state_seq = 0
+        self._hand_flags = {}  # hand_id -> (is_snap, snap confidence, is_peace) from the last new result
+        # A live-stream Tasks landmarker is already asynchronous, so it
+        # doesn't need a worker thread of its own
+        if config.GESTURE_ASYNC_INFERENCE and not getattr(self.hands, 'live_stream', False):
+            self._infer_queue = queue.Queue(maxsize=1)
+            self._results_lock = threading.Lock()
+            self._infer_thread = threading.Thread(target=self._infer_worker, daemon=True)
+            self._infer_thread.start()
+        
+        # Reused downscale and RGB conversion outputs (no per-frame allocation).
+        # In async mode up to two RGB frames are in flight (queued + being
+        # processed), so a third buffer is always free to write into.
+        self._small_buf = None
+        self._rgb_bufs = [None] * (3 if self._infer_thread else 1)
+        self._rgb_idx = 0
+        
+        # 64x64 gray thumbnail of the last frame MediaPipe was run on
+        self._prev_thumb = None
+        
+        # Gesture label text sizes (only a handful of distinct labels exist)
+        self._label_size_cache = {}
+        
         print(f"Gesture detector initialized")
         print(f"Detection confidence: {config.GESTURE_DETECTION_CONFIDENCE}")
         print(f"Cooldown period: {config.GESTURE_COOLDOWN_SECONDS}s")
@@ -67,16 +348,71 @@ class GestureDetector:
             frame: BGR image frame
         
         Returns:
-            Tuple of (gesture_events, annotated_frame)
+            Tuple of (gesture_events, annotated_frame). annotated_frame is
+            frame itself when no hands were detected.
         """
-        # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Downscale first: MediaPipe cost scales with input pixels, and the
+        # landmarks it returns are normalized, so pixel math still uses frame.shape
+        small_frame = frame
+        frame_w = frame.shape[1]
+        infer_w = self._infer_width
+        if 0 < infer_w < frame_w:
+            infer_h = int(frame.shape[0] * infer_w / frame_w)
+            small_shape = (infer_h, infer_w) + frame.shape[2:]
+            if self._small_buf is None or self._small_buf.shape != small_shape:
+                self._small_buf = np.empty(small_shape, dtype=frame.dtype)
+            small_frame = cv2.resize(
+                frame, (infer_w, infer_h), dst=self._small_buf, interpolation=cv2.INTER_AREA
+            )
+        
+        # Skipped frame or static scene: the last result still holds, skip
+        # MediaPipe entirely
+        self._frame_counter += 1
+        run_inference = (
+            self._frame_counter % self._frame_skip == 0 and
+            self._frame_changed(small_frame)
+        )
         
         # Process frame
-        results = self.hands.process(rgb_frame)
+        if self._infer_thread:
+            # Hand the frame to the worker (dropped if it is still busy with
+            # the previous one) and use the most recent finished result
+            if run_inference:
+                try:
+                    self._infer_queue.put_nowait(self._to_rgb(small_frame))
+                    # Buffer is now owned by the worker; write the next frame elsewhere
+                    self._rgb_idx = (self._rgb_idx + 1) % len(self._rgb_bufs)
+                except queue.Full:
+                    # Frame dropped: don't let it become the motion reference
+                    self._prev_thumb = None
+            with self._results_lock:
+                results = self._latest_results
+                results_seq = self._results_seq
+            if results is None:
+                return [], frame
+        else:
+            if run_inference or self._latest_results is None:
+                results = self._process(self._to_rgb(small_frame))
+                # A live-stream landmarker returns the same object until its
+                # callback delivers a new result
+                if results is not self._latest_results:
+                    self._latest_results = results
+                    self._results_seq += 1
+            # Frames skipped by GESTURE_FRAME_SKIP or the motion gate reuse
+            # the last result without counting as a new one
+            results = self._latest_results
+            results_seq = self._results_seq
+        
+        # Only a new result advances the snap/peace state machines; a reused
+        # one is drawn with the flags from its first evaluation
+        fresh_results = results_seq != self._state_seq
+        self._state_seq = results_seq
         
         gesture_events = []
-        annotated_frame = frame.copy()
+        
+        # Copied lazily on the first hand: with no hands in view (the common
+        # case) the input frame is returned untouched, without a full memcpy
+        annotated_frame = frame
         
         if results.multi_hand_landmarks:
             for hand_idx, (hand_landmarks, hand_info) in enumerate(
@@ -86,22 +422,40 @@ class GestureDetector:
                 hand_label = hand_info.classification[0].label
                 hand_id = f"{hand_label}_{hand_idx}"
                 
+                # All 21 landmarks extracted once: pixel array for the bbox and
+                # drawing, Python floats for the gesture math
+                normalized, landmark_px = self._extract_landmarks(hand_landmarks, frame.shape)
+                points = landmark_px.tolist()
+                norm_y = normalized[:, 1].tolist()
+                
                 # Get hand bounding box
-                hand_bbox = self._get_hand_bbox(hand_landmarks, frame.shape)
+                hand_bbox = self._get_hand_bbox(landmark_px, frame.shape)
                 
-                # Detect snap gesture
-                is_snap, confidence, hold_duration = self._detect_snap(
-                    hand_landmarks,
-                    hand_id,
-                    frame.shape
-                )
+                if fresh_results:
+                    # Detect snap gesture
+                    is_snap, confidence, hold_duration = self._detect_snap(
+                        points,
+                        hand_id
+                    )
 
-                # Detect peace sign gesture
-                is_peace, peace_confidence = self._detect_peace_sign(
-                    hand_landmarks,
-                    hand_id,
-                    frame.shape
-                )
+                    # Detect peace sign gesture
+                    is_peace, peace_confidence = self._detect_peace_sign(
+                        norm_y,
+                        points,
+                        hand_id
+                    )
+                    self._hand_flags[hand_id] = (is_snap, confidence, is_peace)
+                    report_peace = is_peace
+                else:
+                    # Reused result: no gesture state advances, but a held
+                    # snap keeps reporting its (wall-clock) hold duration
+                    is_snap, confidence, is_peace = self._hand_flags.get(
+                        hand_id, (False, 0.0, False)
+                    )
+                    hold_duration = 0.0
+                    if is_snap:
+                        hold_duration = time.time() - self.gesture_states[hand_id]['start_time']
+                    report_peace = False
 
                 # Create gesture event if detected
                 if is_snap:
@@ -113,7 +467,7 @@ class GestureDetector:
                         hold_duration=hold_duration
                     )
                     gesture_events.append(gesture_event)
-                elif is_peace:
+                elif report_peace:
                     gesture_event = GestureEvent(
                         gesture_type="peace",
                         hand_bbox=hand_bbox,
@@ -123,34 +477,153 @@ class GestureDetector:
                     )
                     gesture_events.append(gesture_event)
 
-                # Draw gesture if detected
-                if is_snap or is_peace:
-                    annotated_frame = self._draw_gesture(
-                        annotated_frame,
-                        gesture_event,
-                        hand_landmarks
-                    )
+                if not self._draw:
+                    continue
+                
+                if annotated_frame is frame:
+                    annotated_frame = frame.copy()
+                
+                # Draw gesture if detected, otherwise the regular hand box
+                if is_peace and not is_snap:
+                    label = f"PEACE! ({hand_label})"
+                elif is_snap:
+                    label = f"{self._label_text} ({hand_label})"
                 else:
-                    # Draw regular hand detection
-                    annotated_frame = self._draw_hand(
-                        annotated_frame,
-                        hand_bbox,
-                        hand_label,
-                        hand_landmarks
-                    )
+                    label = f"{hand_label} Hand"
+                self._draw_hand(
+                    annotated_frame,
+                    hand_bbox,
+                    label,
+                    landmark_px,
+                    is_snap or is_peace
+                )
         
         return gesture_events, annotated_frame
     
+    def _to_rgb(self, small_frame: np.ndarray) -> np.ndarray:
+        """
+        Convert a BGR frame to RGB for MediaPipe in the current reusable buffer.
+        
+        Args:
+            small_frame: BGR frame at inference resolution
+        
+        Returns:
+            RGB frame (valid until the buffer slot is reused)
+        """
+        rgb_buf = self._rgb_bufs[self._rgb_idx]
+        if rgb_buf is None or rgb_buf.shape != small_frame.shape:
+            rgb_buf = self._rgb_bufs[self._rgb_idx] = np.empty_like(small_frame)
+        return cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+    
+    def _frame_changed(self, small_frame: np.ndarray) -> bool:
+        """
+        Check whether the view moved enough since the last inference frame.
+        
+        Compares 64x64 grayscale thumbnails block by block: the largest
+        8x8-block mean difference is tested, so a change confined to the
+        fingers isn't averaged away over the whole frame, while sensor noise
+        still averages out within each block. After GESTURE_MOTION_MAX_REUSE
+        reused frames inference is forced, so a still hand (e.g. one holding
+        a peace sign) keeps getting fresh results.
+        
+        Args:
+            small_frame: BGR frame at inference resolution
+        
+        Returns:
+            True if MediaPipe should run on this frame
+        """
+        threshold = self._motion_threshold
+        if threshold <= 0:
+            return True
+        
+        thumb = cv2.cvtColor(
+            cv2.resize(small_frame, (64, 64), interpolation=cv2.INTER_AREA),
+            cv2.COLOR_BGR2GRAY
+        )
+        prev = self._prev_thumb
+        if prev is not None and self._motion_reused < self._motion_max_reuse:
+            block_diff = cv2.resize(
+                cv2.absdiff(thumb, prev), (8, 8), interpolation=cv2.INTER_AREA
+            )
+            if block_diff.max() < threshold:
+                self._motion_reused += 1
+                return False
+        
+        # Only advance the reference on inference frames, so slow motion
+        # still accumulates until it crosses the threshold
+        self._prev_thumb = thumb
+        self._motion_reused = 0
+        return True
+    
+    def _process(self, rgb_frame: np.ndarray):
+        """
+        Run the shared hand tracking graph on an RGB frame.
+        
+        Args:
+            rgb_frame: RGB frame at inference resolution
+        
+        Returns:
+            MediaPipe hand results
+        """
+        with _shared_hands_process_lock:
+            return self.hands.process(rgb_frame)
+    
+    def _infer_worker(self) -> None:
+        """Run MediaPipe on queued frames until a None sentinel arrives."""
+        while True:
+            rgb_frame = self._infer_queue.get()
+            if rgb_frame is None:
+                return
+            try:
+                results = self._process(rgb_frame)
+            except Exception as e:
+                print(f"⚠️  Gesture inference failed: {e}")
+                continue
+            with self._results_lock:
+                self._latest_results = results
+                self._results_seq += 1
+    
+    def _extract_landmarks(
+        self,
+        hand_landmarks,
+        frame_shape: Tuple[int, int, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read all hand landmarks once, as normalized and pixel coordinates.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks
+            frame_shape: Frame dimensions (height, width, channels)
+        
+        Returns:
+            Tuple of (normalized, pixels), both (21, 2) float32 (x, y) arrays.
+            The pixel array is reused for the next hand, so consume it
+            before extracting another one.
+        """
+        h, w, _ = frame_shape
+        if self._px_scale_shape != frame_shape:
+            self._px_scale = np.array((w, h), dtype=np.float32)
+            self._px_scale_shape = frame_shape
+        
+        # Stream x, y straight into a flat float32 array (no tuple list),
+        # then scale into the reused buffer
+        normalized = np.fromiter(
+            chain.from_iterable((lm.x, lm.y) for lm in hand_landmarks.landmark),
+            dtype=np.float32,
+            count=42
+        ).reshape(21, 2)
+        return normalized, np.multiply(normalized, self._px_scale, out=self._landmark_px)
+    
     def _get_hand_bbox(
         self, 
-        hand_landmarks, 
+        landmark_px: np.ndarray, 
         frame_shape: Tuple[int, int, int]
     ) -> Tuple[int, int, int, int]:
         """
         Calculate bounding box for hand.
         
         Args:
-            hand_landmarks: MediaPipe hand landmarks
+            landmark_px: (21, 2) landmark pixel coordinates
             frame_shape: Frame dimensions (height, width, channels)
         
         Returns:
@@ -158,15 +631,9 @@ class GestureDetector:
         """
         h, w, _ = frame_shape
         
-        # Get all landmark coordinates
-        x_coords = [lm.x * w for lm in hand_landmarks.landmark]
-        y_coords = [lm.y * h for lm in hand_landmarks.landmark]
-        
         # Calculate bounding box
-        x_min = int(min(x_coords))
-        x_max = int(max(x_coords))
-        y_min = int(min(y_coords))
-        y_max = int(max(y_coords))
+        x_min, y_min = landmark_px.min(axis=0).astype(int).tolist()
+        x_max, y_max = landmark_px.max(axis=0).astype(int).tolist()
         
         # Add padding
         padding = 20
@@ -179,104 +646,107 @@ class GestureDetector:
     
     def _detect_peace_sign(
         self,
-        hand_landmarks,
-        hand_id: str,
-        frame_shape: Tuple[int, int, int]
+        norm_y: List[float],
+        points: List[List[float]],
+        hand_id: str
     ) -> Tuple[bool, float]:
         """
         Detect peace sign gesture with robust multi-criteria checking.
         Requires temporal stability (multiple consecutive frames) for reliable detection.
 
         Args:
-            hand_landmarks: MediaPipe hand landmarks
+            norm_y: 21 normalized landmark y coordinates (0 = top of frame)
+            points: 21 [x, y] landmark pixel coordinates as Python floats
             hand_id: Unique hand identifier
-            frame_shape: Frame dimensions
 
         Returns:
             Tuple of (is_peace_detected, confidence)
         """
-        h, w, _ = frame_shape
 
-        # Get key landmarks for fingers
+        # Normalized heights of the key landmarks
         # Tips (endpoints of fingers)
-        thumb_tip = hand_landmarks.landmark[4]
-        index_tip = hand_landmarks.landmark[8]
-        middle_tip = hand_landmarks.landmark[12]
-        ring_tip = hand_landmarks.landmark[16]
-        pinky_tip = hand_landmarks.landmark[20]
-
-        # PIPs (middle joints) - used to check if fingers are extended
-        thumb_ip = hand_landmarks.landmark[3]
-        index_pip = hand_landmarks.landmark[6]
-        index_dip = hand_landmarks.landmark[7]
-        middle_pip = hand_landmarks.landmark[10]
-        middle_dip = hand_landmarks.landmark[11]
-        ring_pip = hand_landmarks.landmark[14]
-        pinky_pip = hand_landmarks.landmark[18]
+        thumb_tip_y = norm_y[4]
+        index_tip_y = norm_y[8]
+        middle_tip_y = norm_y[12]
+        ring_tip_y = norm_y[16]
+        pinky_tip_y = norm_y[20]
+
+        # PIPs/DIPs (middle joints) - used to check if fingers are extended
+        index_pip_y = norm_y[6]
+        index_dip_y = norm_y[7]
+        middle_pip_y = norm_y[10]
+        middle_dip_y = norm_y[11]
 
         # MCPs (base joints)
-        index_mcp = hand_landmarks.landmark[5]
-        middle_mcp = hand_landmarks.landmark[9]
-        ring_mcp = hand_landmarks.landmark[13]
-        pinky_mcp = hand_landmarks.landmark[17]
-        thumb_mcp = hand_landmarks.landmark[2]
-
-        # Wrist for reference
-        wrist = hand_landmarks.landmark[0]
-
-        # Convert to pixel coordinates for distance calculations
-        def to_pixels(landmark):
-            return np.array([landmark.x * w, landmark.y * h])
-
-        index_tip_px = to_pixels(index_tip)
-        middle_tip_px = to_pixels(middle_tip)
-        ring_tip_px = to_pixels(ring_tip)
-        pinky_tip_px = to_pixels(pinky_tip)
-        thumb_tip_px = to_pixels(thumb_tip)
-        wrist_px = to_pixels(wrist)
-        index_mcp_px = to_pixels(index_mcp)
-        palm_center_px = to_pixels(hand_landmarks.landmark[9])  # Middle finger MCP as palm reference
+        index_mcp_y = norm_y[5]
+        middle_mcp_y = norm_y[9]
+        ring_mcp_y = norm_y[13]
+        pinky_mcp_y = norm_y[17]
+        thumb_mcp_y = norm_y[2]
+
+        # Pixel coordinates as plain (x, y) floats for distance calculations
+        # (math.dist/atan2 on scalars, no per-point NumPy arrays; bound to
+        # locals since they are used several times per hand per frame)
+        dist = math.dist
+        atan2 = math.atan2
+        degrees = math.degrees
+        px = points
+        index_tip_px = px[8]
+        middle_tip_px = px[12]
+        ring_tip_px = px[16]
+        pinky_tip_px = px[20]
+        wrist_px = px[0]
+        index_mcp_px = px[5]
+        middle_mcp_px = px[9]
+        ring_mcp_px = px[13]
+        palm_center_px = middle_mcp_px  # Middle finger MCP as palm reference
 
         # 1. Check if index and middle fingers are FULLY extended
         # More robust: check all joints from tip to base
         index_extended = (
-            index_tip.y < index_dip.y < index_pip.y < index_mcp.y and
-            (index_tip.y < index_mcp.y - 0.1)  # Significant extension
+            index_tip_y < index_dip_y < index_pip_y < index_mcp_y and
+            (index_tip_y < index_mcp_y - 0.1)  # Significant extension
         )
         middle_extended = (
-            middle_tip.y < middle_dip.y < middle_pip.y < middle_mcp.y and
-            (middle_tip.y < middle_mcp.y - 0.1)  # Significant extension
+            middle_tip_y < middle_dip_y < middle_pip_y < middle_mcp_y and
+            (middle_tip_y < middle_mcp_y - 0.1)  # Significant extension
         )
 
         # 2. Check if ring and pinky are CLEARLY folded
         # More robust: tips should be closer to palm than MCPs
-        ring_folded = (ring_tip.y >= ring_mcp.y - 0.03)
-        pinky_folded = (pinky_tip.y >= pinky_mcp.y - 0.03)
+        ring_folded = (ring_tip_y >= ring_mcp_y - 0.03)
+        pinky_folded = (pinky_tip_y >= pinky_mcp_y - 0.03)
+
+        # 3. Check thumb position (should not be extended upward)
+        thumb_not_up = (thumb_tip_y >= thumb_mcp_y - 0.05)
+
+        # The five checks below can add at most 5 criteria, so with fewer
+        # than 2 of the height-only checks passing, 7/10 is out of reach
+        if index_extended + middle_extended + ring_folded + pinky_folded + thumb_not_up < 2:
+            return False, 0.0
         
         # Additional check: ring and pinky should be close to palm
-        ring_to_palm_dist = np.linalg.norm(ring_tip_px - palm_center_px)
-        pinky_to_palm_dist = np.linalg.norm(pinky_tip_px - palm_center_px)
-        hand_size = np.linalg.norm(index_mcp_px - wrist_px)
+        ring_to_palm_dist = dist(ring_tip_px, palm_center_px)
+        pinky_to_palm_dist = dist(pinky_tip_px, palm_center_px)
+        hand_size = dist(index_mcp_px, wrist_px)
         ring_close_to_palm = ring_to_palm_dist < hand_size * 0.6
         pinky_close_to_palm = pinky_to_palm_dist < hand_size * 0.7
 
-        # 3. Check thumb position (should not be extended upward)
-        thumb_not_up = (thumb_tip.y >= thumb_mcp.y - 0.05)
-
         # 4. Check finger spacing - peace sign has moderate separation
-        index_middle_distance_px = np.linalg.norm(index_tip_px - middle_tip_px)
+        index_middle_distance_px = dist(index_tip_px, middle_tip_px)
         index_middle_distance_norm = index_middle_distance_px / hand_size
         
         # Peace sign: fingers slightly separated but not too far apart (more lenient range)
         fingers_properly_spaced = (0.1 < index_middle_distance_norm < 0.6)
 
         # 5. Check finger angles (should point roughly upward)
-        index_vector = index_tip_px - index_mcp_px
-        middle_vector = middle_tip_px - to_pixels(middle_mcp)
-        
         # Calculate angles from vertical
-        index_angle = np.degrees(np.arctan2(index_vector[0], -index_vector[1]))
-        middle_angle = np.degrees(np.arctan2(middle_vector[0], -middle_vector[1]))
+        index_angle = degrees(atan2(
+            index_tip_px[0] - index_mcp_px[0], index_mcp_px[1] - index_tip_px[1]
+        ))
+        middle_angle = degrees(atan2(
+            middle_tip_px[0] - middle_mcp_px[0], middle_mcp_px[1] - middle_tip_px[1]
+        ))
         
         # Fingers should point generally upward (within 60 degrees of vertical - more lenient)
         index_upright = abs(index_angle) < 60
@@ -286,62 +756,59 @@ class GestureDetector:
         fingers_parallel = abs(index_angle - middle_angle) < 40
 
         # 6. Check that extended fingers are significantly longer than folded ones
-        index_length = np.linalg.norm(index_tip_px - index_mcp_px)
-        middle_length = np.linalg.norm(middle_tip_px - to_pixels(middle_mcp))
-        ring_length = np.linalg.norm(ring_tip_px - to_pixels(ring_mcp))
+        index_length = dist(index_tip_px, index_mcp_px)
+        middle_length = dist(middle_tip_px, middle_mcp_px)
+        ring_length = dist(ring_tip_px, ring_mcp_px)
         
         extended_significantly_longer = (
             index_length > ring_length * 1.3 and
             middle_length > ring_length * 1.3
         )
 
-        # Combine all criteria with scoring
-        criteria = {
-            'index_extended': index_extended,
-            'middle_extended': middle_extended,
-            'ring_folded': ring_folded and ring_close_to_palm,
-            'pinky_folded': pinky_folded and pinky_close_to_palm,
-            'thumb_not_up': thumb_not_up,
-            'fingers_spaced': fingers_properly_spaced,
-            'index_upright': index_upright,
-            'middle_upright': middle_upright,
-            'fingers_parallel': fingers_parallel,
-            'length_check': extended_significantly_longer
-        }
+        # Combine all criteria into a bitmask (bit order = PEACE_CRITERIA)
+        criteria_mask = (
+            index_extended
+            | middle_extended << 1
+            | (ring_folded and ring_close_to_palm) << 2
+            | (pinky_folded and pinky_close_to_palm) << 3
+            | thumb_not_up << 4
+            | fingers_properly_spaced << 5
+            | index_upright << 6
+            | middle_upright << 7
+            | fingers_parallel << 8
+            | extended_significantly_longer << 9
+        )
         
         # Count how many criteria are met
-        criteria_met = sum(criteria.values())
-        total_criteria = len(criteria)
+        criteria_met = bin(criteria_mask).count('1')
+        total_criteria = len(PEACE_CRITERIA)
         
         # Require at least 7 out of 10 criteria to be met (more lenient)
         is_peace_candidate = criteria_met >= 7
 
+        current_time = time.time()
+
         # Initialize stability tracking
-        if hand_id not in self.peace_stability:
-            self.peace_stability[hand_id] = {
-                'frames': [],
-                'last_update': time.time()
+        stability = self.peace_stability.get(hand_id)
+        if stability is None:
+            stability = self.peace_stability[hand_id] = {
+                'frames': deque(),  # (time, confidence) per candidate frame
+                'last_update': current_time
             }
 
-        current_time = time.time()
-        stability = self.peace_stability[hand_id]
+        frames = stability['frames']
         
-        # Clear old frames (older than 0.5 seconds)
-        stability['frames'] = [
-            f for f in stability['frames'] 
-            if current_time - f['time'] < 0.5
-        ]
+        # Clear old frames (older than 0.5 seconds); entries are in time
+        # order, so stop at the first fresh one
+        while frames and current_time - frames[0][0] >= 0.5:
+            frames.popleft()
         
         # Add current detection
         if is_peace_candidate:
-            stability['frames'].append({
-                'time': current_time,
-                'confidence': criteria_met / total_criteria,
-                'criteria': criteria
-            })
+            frames.append((current_time, criteria_met / total_criteria))
         
         # Require stable detection over at least 2 consecutive frames (more responsive)
-        stable_frames = len(stability['frames'])
+        stable_frames = len(frames)
         is_peace = is_peace_candidate and stable_frames >= 2
 
         # Calculate confidence
@@ -357,89 +824,68 @@ class GestureDetector:
             # Check cooldown to prevent spam
             cooldown_key = f"peace_{hand_id}"
             if cooldown_key in self.gesture_cooldowns:
-                if current_time - self.gesture_cooldowns[cooldown_key] < config.GESTURE_COOLDOWN_SECONDS:
+                if current_time - self.gesture_cooldowns[cooldown_key] < self._cooldown_seconds:
                     return False, 0.0
 
             # Update cooldown
             self.gesture_cooldowns[cooldown_key] = current_time
             
             # Clear stability after detection
-            stability['frames'] = []
+            frames.clear()
             
             print(f"✌️ PEACE SIGN detected! Hand: {hand_id}, Confidence: {confidence:.2f}, "
                   f"Criteria: {criteria_met}/{total_criteria}, Stable frames: {stable_frames}")
-            print(f"   Details: {', '.join([k for k, v in criteria.items() if v])}")
+            met_names = [
+                name for bit, name in enumerate(PEACE_CRITERIA) if criteria_mask >> bit & 1
+            ]
+            print(f"   Details: {', '.join(met_names)}")
 
         return is_peace, confidence
 
     def _detect_snap(
         self,
-        hand_landmarks,
-        hand_id: str,
-        frame_shape: Tuple[int, int, int]
+        points: List[List[float]],
+        hand_id: str
     ) -> Tuple[bool, float, float]:
         """
         Detect snap gesture by identifying the crossed X shape formed by 
         thumb and index finger after a snap.
         
         Args:
-            hand_landmarks: MediaPipe hand landmarks
+            points: 21 [x, y] landmark pixel coordinates as Python floats
             hand_id: Unique hand identifier
-            frame_shape: Frame dimensions
         
         Returns:
             Tuple of (is_snap_detected, confidence, hold_duration)
         """
-        h, w, _ = frame_shape
-        
-        # Get key landmarks
-        thumb_tip = hand_landmarks.landmark[4]      # Thumb tip
-        thumb_ip = hand_landmarks.landmark[3]       # Thumb IP joint
-        index_tip = hand_landmarks.landmark[8]      # Index finger tip
-        index_mcp = hand_landmarks.landmark[5]      # Index finger base (MCP joint)
-        middle_tip = hand_landmarks.landmark[12]    # Middle finger tip
-        
-        # Convert to pixel coordinates
-        thumb_tip_pos = np.array([thumb_tip.x * w, thumb_tip.y * h])
-        thumb_ip_pos = np.array([thumb_ip.x * w, thumb_ip.y * h])
-        index_tip_pos = np.array([index_tip.x * w, index_tip.y * h])
-        index_mcp_pos = np.array([index_mcp.x * w, index_mcp.y * h])
-        middle_tip_pos = np.array([middle_tip.x * w, middle_tip.y * h])
-        
         # Initialize tracking for this hand if needed
-        if hand_id not in self.gesture_states:
-            self.gesture_states[hand_id] = {
+        state = self.gesture_states.get(hand_id)
+        if state is None:
+            state = self.gesture_states[hand_id] = {
                 'active': False,
                 'start_time': 0,
                 'last_print_time': 0,
                 'payment_triggered': False  # Track if payment sent this hold
             }
         
-        # Check if thumb and index are in snap position
-        thumb_index_distance = np.linalg.norm(thumb_tip_pos - index_tip_pos)
-        index_middle_distance = np.linalg.norm(index_tip_pos - middle_tip_pos)
-        
-        # Calculate crossing angle
-        index_vector = index_tip_pos - index_mcp_pos
-        thumb_vector = thumb_tip_pos - thumb_ip_pos
-        
-        cos_angle = np.dot(index_vector, thumb_vector) / (
-            np.linalg.norm(index_vector) * np.linalg.norm(thumb_vector) + 1e-6
-        )
-        angle_degrees = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+        # Finger distances and crossing angle between index and thumb
+        thumb_index_distance, index_middle_distance, cos_angle = \
+            _snap_geometry(points)
         
         # Snap position criteria (holding the snap pose)
         # More relaxed thresholds to maintain detection while holding
         in_snap_position = (
             thumb_index_distance < 40 and          # Fingers are close/touching (relaxed threshold)
-            20 < angle_degrees < 90 and            # Fingers form crossing angle (relaxed)
+            SNAP_COS_MIN < cos_angle < SNAP_COS_MAX and  # Fingers cross at 20-90 degrees (relaxed)
             index_middle_distance > 20             # Middle finger is separated (relaxed)
         )
         
         current_time = time.time()
-        state = self.gesture_states[hand_id]
         
         if in_snap_position:
+            # Angle only needed for scoring once in position
+            angle_degrees = math.degrees(math.acos(cos_angle))
+            
             # Calculate confidence
             distance_score = max(0, 1.0 - (thumb_index_distance / 40))
             angle_score = 1.0 - abs(angle_degrees - 50) / 40
@@ -475,130 +921,95 @@ class GestureDetector:
             
             return False, 0.0, 0.0
     
-    def _draw_gesture(
+    def _draw_hand(
         self,
         frame: np.ndarray,
-        gesture_event: GestureEvent,
-        hand_landmarks
-    ) -> np.ndarray:
+        hand_bbox: Tuple[int, int, int, int],
+        label: str,
+        landmark_px: np.ndarray,
+        is_gesture: bool
+    ) -> None:
         """
-        Draw detected gesture on frame.
+        Draw a detected hand on the frame in place.
         
-        Args:
-            frame: Image frame
-            gesture_event: Detected gesture event
-            hand_landmarks: MediaPipe hand landmarks
+        Gestures get the configured box color with a filled label above the
+        box; plain hands get a thin blue box with the label inside.
         
-        Returns:
-            Annotated frame
+        Args:
+            frame: Image frame (drawn on in place)
+            hand_bbox: Hand bounding box (x, y, width, height)
+            label: Text to draw
+            landmark_px: (21, 2) landmark pixel coordinates
+            is_gesture: Whether a gesture was detected for this hand
         """
-        x, y, w, h = gesture_event.hand_bbox
-        
-        # Draw bounding box (green for detected gesture)
-        cv2.rectangle(
-            frame,
-            (x, y),
-            (x + w, y + h),
-            config.GESTURE_BOX_COLOR,
-            config.GESTURE_BOX_THICKNESS
-        )
+        x, y, w, h = hand_bbox
         
-        # Draw gesture label based on type
-        if gesture_event.gesture_type == "peace":
-            label = f"PEACE! ({gesture_event.hand_label})"
+        if is_gesture:
+            # Green box with a filled label background above it
+            color = self._box_color
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, self._box_thickness)
+            
+            label_size = self._label_size_cache.get(label)
+            if label_size is None:
+                label_size = cv2.getTextSize(
+                    label,
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.8,
+                    2
+                )[0]
+                self._label_size_cache[label] = label_size
+            
+            cv2.rectangle(
+                frame,
+                (x, y - label_size[1] - 10),
+                (x + label_size[0] + 10, y),
+                color,
+                -1
+            )
+            cv2.putText(
+                frame,
+                label,
+                (x + 5, y - 5),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.8,
+                (255, 255, 255),
+                2,
+                cv2.LINE_AA
+            )
         else:
-            label = f"{config.GESTURE_LABEL_TEXT} ({gesture_event.hand_label})"
-        label_size = cv2.getTextSize(
-            label,
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            2
-        )[0]
-        
-        # Draw label background
-        cv2.rectangle(
-            frame,
-            (x, y - label_size[1] - 10),
-            (x + label_size[0] + 10, y),
-            config.GESTURE_BOX_COLOR,
-            -1
-        )
-        
-        # Draw label text
-        cv2.putText(
-            frame,
-            label,
-            (x + 5, y - 5),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (255, 255, 255),
-            2,
-            cv2.LINE_AA
-        )
-        
-        # Draw hand landmarks if enabled
-        if config.SHOW_HAND_LANDMARKS:
-            self.mp_draw.draw_landmarks(
+            # Blue box for hand without gesture, label inside
+            color = (255, 150, 0)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+            cv2.putText(
                 frame,
-                hand_landmarks,
-                self.mp_hands.HAND_CONNECTIONS
+                label,
+                (x + 5, y + 20),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                color,
+                1,
+                cv2.LINE_AA
             )
         
-        return frame
+        # Draw hand landmarks if enabled
+        if self._show_landmarks:
+            self._draw_landmarks(frame, landmark_px)
     
-    def _draw_hand(
-        self,
-        frame: np.ndarray,
-        hand_bbox: Tuple[int, int, int, int],
-        hand_label: str,
-        hand_landmarks
-    ) -> np.ndarray:
+    def _draw_landmarks(self, frame: np.ndarray, landmark_px: np.ndarray) -> None:
         """
-        Draw detected hand (no gesture) on frame.
+        Draw hand landmarks and connections (same look as MediaPipe's drawing_utils).
         
-        Args:
-            frame: Image frame
-            hand_bbox: Hand bounding box
-            hand_label: "Left" or "Right"
-            hand_landmarks: MediaPipe hand landmarks
+        All connections go through a single cv2.polylines call instead of
+        one Python-level cv2.line per connection.
         
-        Returns:
-            Annotated frame
+        Args:
+            frame: Image frame (drawn on in place)
+            landmark_px: (21, 2) landmark pixel coordinates
         """
-        x, y, w, h = hand_bbox
-        
-        # Draw bounding box (blue for hand without gesture)
-        color = (255, 150, 0)  # Blue
-        cv2.rectangle(
-            frame,
-            (x, y),
-            (x + w, y + h),
-            color,
-            2
-        )
-        
-        # Draw hand label
-        label = f"{hand_label} Hand"
-        cv2.putText(
-            frame,
-            label,
-            (x + 5, y + 20),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            color,
-            1,
-            cv2.LINE_AA
-        )
-        
-        # Draw hand landmarks if enabled
-        if config.SHOW_HAND_LANDMARKS:
-            self.mp_draw.draw_landmarks(
-                frame,
-                hand_landmarks,
-                self.mp_hands.HAND_CONNECTIONS
-            )
-        
-        return frame
+        points = landmark_px.astype(np.int32)
+        cv2.polylines(frame, points[self._hand_connections], False, (224, 224, 224), 2)
+        for point in points.tolist():
+            cv2.circle(frame, point, 2, (0, 0, 255), 2)
     
     def reset(self):
         """Reset tracking state."""
@@ -607,8 +1018,20 @@ class GestureDetector:
         self.last_detection_time = {}
         self.gesture_states = {}
         self.peace_stability = {}
+        self._hand_flags = {}
     
     def close(self):
-        """Clean up resources."""
-        self.hands.close()
+        """Clean up resources. Safe to call more than once."""
+        if self.hands is None:
+            return
+        if self._infer_thread and self._infer_thread.is_alive():
+            # Drop any waiting frame so the stop sentinel fits in the queue
+            try:
+                self._infer_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._infer_queue.put(None)
+            self._infer_thread.join()
+        self.hands = None
+        _release_hands()
 
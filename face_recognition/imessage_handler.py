@@ -2,10 +2,12 @@
 iMessage handler for sending messages on macOS.
 Uses AppleScript to send messages via the Messages app.
 """
+import atexit
+import queue
 import subprocess
+import threading
 import time
 from typing import Optional, Tuple
-import re
 
 
 class IMessageHandler:
@@ -18,6 +20,26 @@ class IMessageHandler:
         self.cooldown_seconds = 5  # Prevent spam
         self.transcript_lookback_seconds = 15  # How many seconds of transcript to capture
 
+        # AppleScript send script, built once. osascript passes the message
+        # as argv so it never has to be escaped into the script source
+        self._send_script = (
+            'on run argv\n'
+            '    tell application "Messages"\n'
+            '        set targetService to 1st service whose service type = iMessage\n'
+            f'        set targetBuddy to buddy "{self.phone_number}" of targetService\n'
+            '        send (item 1 of argv) to targetBuddy\n'
+            '    end tell\n'
+            'end run\n'
+        )
+
+        # Messages are delivered by a background worker so a slow AppleScript
+        # never stalls the video loop
+        self._send_queue = queue.Queue()
+        self._send_thread = threading.Thread(target=self._send_worker, daemon=True)
+        self._send_thread.start()
+        # Deliver anything still queued when the interpreter exits
+        atexit.register(self.close)
+
         print(f"\n📱 iMessage Handler initialized")
         print(f"   Phone number: {self.phone_number}")
         print(f"   Will capture last {self.transcript_lookback_seconds} seconds of transcript")
@@ -25,7 +47,30 @@ class IMessageHandler:
 
     def send_imessage(self, message: str) -> bool:
         """
-        Send an iMessage using AppleScript.
+        Queue an iMessage for sending by the background worker.
+
+        Returns immediately; the outcome is printed once the message has
+        been sent. The cooldown starts when the worker delivers the message,
+        and no new message is accepted while one is still waiting to be sent.
+        Use send_imessage_sync() when the result is needed.
+
+        Args:
+            message: The message text to send
+
+        Returns:
+            True if the message was queued, False otherwise
+        """
+        message = self._prepare_message(message)
+        if message is None:
+            return False
+
+        self._send_queue.put(message)
+        print(f"📤 iMessage queued for {self.phone_number}")
+        return True
+
+    def send_imessage_sync(self, message: str) -> bool:
+        """
+        Send an iMessage using AppleScript and wait for the result.
 
         Args:
             message: The message text to send
@@ -33,47 +78,65 @@ class IMessageHandler:
         Returns:
             True if sent successfully, False otherwise
         """
+        message = self._prepare_message(message)
+        if message is None:
+            return False
+
+        if self._deliver(message):
+            self.last_send_time = time.time()
+            return True
+        return False
+
+    def _prepare_message(self, message: str) -> Optional[str]:
+        """
+        Apply the cooldown and clean the message text.
+
+        Args:
+            message: The message text to send
+
+        Returns:
+            Cleaned message, or None if it should not be sent
+        """
+        # A queued message will start the cooldown once it is delivered
+        if self._send_queue.unfinished_tasks:
+            print("⏳ Previous iMessage still sending")
+            return None
+
         # Check cooldown
         current_time = time.time()
         if current_time - self.last_send_time < self.cooldown_seconds:
             remaining = self.cooldown_seconds - (current_time - self.last_send_time)
             print(f"⏳ Cooldown active: {remaining:.1f}s remaining")
-            return False
+            return None
 
         # Clean the message
         message = message.strip()
         if not message:
             print("⚠️  Empty message, not sending")
-            return False
+            return None
 
-        # Escape quotes for AppleScript
-        message = message.replace('"', '\\"')
+        return message
 
-        # Create AppleScript command
-        applescript = f'''
-        tell application "Messages"
-            set targetService to 1st service whose service type = iMessage
-            set targetBuddy to buddy "{self.phone_number}" of targetService
-            send "{message}" to targetBuddy
-        end tell
-        '''
+    def _deliver(self, message: str) -> bool:
+        """
+        Run the AppleScript that sends a message.
+
+        Args:
+            message: Cleaned message text
 
+        Returns:
+            True if sent successfully, False otherwise
+        """
         try:
             # Execute AppleScript
-            result = subprocess.run(
-                ['osascript', '-e', applescript],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                self.last_send_time = current_time
+            success, error = self._run_osascript(self._send_script, message)
+
+            if success:
                 print(f"✅ iMessage sent to {self.phone_number}")
                 print(f"   Message: {message[:100]}...")
                 return True
             else:
-                print(f"❌ Failed to send iMessage: {result.stderr}")
+                print(f"❌ Failed to send iMessage: {error}")
                 return False
 
         except subprocess.TimeoutExpired:
@@ -83,19 +146,82 @@ class IMessageHandler:
             print(f"❌ Error sending iMessage: {e}")
             return False
 
+    def _send_worker(self):
+        """Background worker that delivers queued messages."""
+        while True:
+            message = self._send_queue.get()
+            if message is None:
+                break
+            # Only a successful send starts the cooldown
+            if self._deliver(message):
+                self.last_send_time = time.time()
+            self._send_queue.task_done()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Stop the send worker after delivering any queued messages.
+
+        Args:
+            timeout: Maximum seconds to wait for pending sends
+        """
+        if self._send_thread.is_alive():
+            self._send_queue.put(None)
+            self._send_thread.join(timeout)
+
+        # Don't keep this handler alive until interpreter exit
+        atexit.unregister(self.close)
+
+    def _run_osascript(self, applescript: str, *args: str) -> Tuple[bool, Optional[str]]:
+        """
+        Execute an AppleScript with osascript.
+
+        Args:
+            applescript: AppleScript source to run
+            *args: Arguments passed to the script's run handler as argv
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        result = subprocess.run(
+            ['osascript', '-e', applescript, *args],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            return False, result.stderr
+        return True, None
+
     def can_send(self) -> bool:
         """
         Check if we can send a message (cooldown check).
 
         Returns:
-            True if cooldown period has passed
+            True if cooldown period has passed and no message is waiting to be sent
         """
+        if self._send_queue.unfinished_tasks:
+            return False
         current_time = time.time()
         return current_time - self.last_send_time >= self.cooldown_seconds
 
     def send_transcript(self, transcript: str) -> bool:
         """
-        Send the provided transcript via iMessage.
+        Queue the provided transcript for sending via iMessage.
+
+        Args:
+            transcript: The transcript text to send
+
+        Returns:
+            True if queued for sending, False otherwise
+        """
+        transcript = self._prepare_transcript(transcript)
+        if transcript is None:
+            return False
+        return self.send_imessage(transcript)
+
+    def send_transcript_sync(self, transcript: str) -> bool:
+        """
+        Send the provided transcript via iMessage and wait for the result.
 
         Args:
             transcript: The transcript text to send
@@ -103,12 +229,26 @@ class IMessageHandler:
         Returns:
             True if sent successfully, False otherwise
         """
-        if not transcript or not transcript.strip():
-            print("⚠️  No transcript to send")
+        transcript = self._prepare_transcript(transcript)
+        if transcript is None:
             return False
+        return self.send_imessage_sync(transcript)
 
+    def _prepare_transcript(self, transcript: str) -> Optional[str]:
+        """
+        Clean and truncate a transcript for sending.
+
+        Args:
+            transcript: The transcript text to send
+
+        Returns:
+            Transcript text, or None if there is nothing to send
+        """
         # Clean up the transcript
-        transcript = transcript.strip()
+        transcript = transcript.strip() if transcript else ""
+        if not transcript:
+            print("⚠️  No transcript to send")
+            return None
 
         # Truncate if too long (iMessage has limits)
         max_length = 1000
@@ -118,7 +258,7 @@ class IMessageHandler:
         print(f"\n📱 Sending last {self.transcript_lookback_seconds}s of transcript via iMessage")
         print(f"   Preview: {transcript[:100]}...")
 
-        return self.send_imessage(transcript)
+        return transcript
 
     def get_status(self) -> dict:
         """
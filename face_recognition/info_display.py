@@ -1,13 +1,66 @@
 """
 Information display module for rendering person details on video frames.
 """
+import re
+import threading
 import cv2
 import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Tuple, Optional
 import config
 from person_info import PersonInfo
 
 
+@lru_cache(maxsize=2048)
+def _measure_text(text: str, font_scale: float, thickness: int) -> Tuple[Tuple[int, int], int]:
+    """
+    Measure text with cv2.getTextSize, memoized since the same lines are
+    measured again on every frame.
+    
+    Args:
+        text: Text to measure
+        font_scale: Font scale (FONT_HERSHEY_SIMPLEX)
+        thickness: Line thickness
+    
+    Returns:
+        ((width, height), baseline) as returned by cv2.getTextSize
+    """
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
+# Summary lines containing these look like LLM artifacts and are skipped
+_SKIP_PHRASES = (
+    'here is', 'here are', 'here\'s',
+    'example:', 'format:',
+    'given this', 'write', 'rules:',
+    'note:', 'summary:',
+    '...'  # Skip lines with ellipsis
+)
+
+# Bullets and dashes removed from summary lines
+_STRIP_CHARS_TABLE = str.maketrans('', '', '•◦▪▫–—*→►')
+
+# Emojis (basic removal of common unicode ranges)
+_EMOJI_RE = re.compile("["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags
+    u"\U00002702-\U000027B0"
+    u"\U000024C2-\U0001F251"
+    "]+", flags=re.UNICODE)
+
+# Formatted lines and box dimensions per displayed person (LRU), so a stable
+# PersonInfo is only formatted and measured once instead of every frame
+_LAYOUT_CACHE_SIZE = 64
+_layout_cache = OrderedDict()
+
+# Float scratch buffer for the background blend, grown to the largest box
+# seen and reused across frames (per thread)
+_scratch = threading.local()
+
+
 def draw_person_info_box(
     frame: np.ndarray,
     person_info: PersonInfo,
@@ -28,11 +81,8 @@ def draw_person_info_box(
     """
     top, right, bottom, left = face_location
     
-    # Prepare text lines
-    lines = _format_person_info(person_info)
-    
-    # Calculate box dimensions
-    box_width, box_height, line_heights = _calculate_box_dimensions(lines)
+    # Prepare text lines and box dimensions (cached per person info content)
+    lines, box_width, box_height, line_heights = _get_layout(person_info)
     
     # Calculate box position
     box_x, box_y = _calculate_box_position(
@@ -48,6 +98,39 @@ def draw_person_info_box(
     return frame
 
 
+def _get_layout(person_info: PersonInfo) -> Tuple[list, int, int, list]:
+    """
+    Get the formatted lines and box dimensions for a person, reusing the
+    cached layout while the displayed fields are unchanged.
+    
+    Args:
+        person_info: PersonInfo object
+    
+    Returns:
+        Tuple of (lines, box_width, box_height, line_heights)
+    """
+    key = (
+        person_info.person_id,
+        person_info.status,
+        person_info.full_name,
+        person_info.email,
+        person_info.summary
+    )
+    layout = _layout_cache.get(key)
+    if layout is not None:
+        _layout_cache.move_to_end(key)
+        return layout
+    
+    lines = _format_person_info(person_info)
+    layout = (lines,) + _calculate_box_dimensions(lines)
+    
+    _layout_cache[key] = layout
+    if len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+    
+    return layout
+
+
 def _format_person_info(person_info: PersonInfo) -> list:
     """
     Format person info into display lines with modern styling.
@@ -60,24 +143,28 @@ def _format_person_info(person_info: PersonInfo) -> list:
         List of (text, font_scale, is_bold, color) tuples
     """
     lines = []
+    debug = config.DEBUG_INFO_DISPLAY
 
-    print(f"\n🎨 [DEBUG] Formatting display for person")
-    print(f"   Status: {person_info.status}")
-    print(f"   Full name: {person_info.full_name}")
-    print(f"   Email: {person_info.email}")
-    print(f"   Summary length: {len(person_info.summary)} chars")
-    print(f"   Summary preview: {person_info.summary[:100] if person_info.summary else 'None'}...")
+    if debug:
+        print(f"\n🎨 [DEBUG] Formatting display for person")
+        print(f"   Status: {person_info.status}")
+        print(f"   Full name: {person_info.full_name}")
+        print(f"   Email: {person_info.email}")
+        print(f"   Summary length: {len(person_info.summary)} chars")
+        print(f"   Summary preview: {person_info.summary[:100] if person_info.summary else 'None'}...")
 
     # Check status
     if person_info.status == "scraping":
-        print(f"   → Displaying scraping status")
+        if debug:
+            print(f"   → Displaying scraping status")
         lines.append(("SCANNING...", 0.6, True, (0, 255, 255)))  # Cyan color for scanning
         lines.append(("", config.INFO_FONT_SCALE_NORMAL, False, config.INFO_TEXT_COLOR))
         lines.append(("Analyzing facial data", 0.35, False, (180, 180, 180)))
         return lines
 
     if person_info.status == "error":
-        print(f"   → Displaying error status")
+        if debug:
+            print(f"   → Displaying error status")
         lines.append(("ERROR", 0.6, True, (0, 100, 255)))  # Orange for error
         lines.append(("Unable to retrieve data", 0.35, False, (180, 180, 180)))
         return lines
@@ -94,7 +181,7 @@ def _format_person_info(person_info: PersonInfo) -> list:
         
         for word in words:
             # Check if single word is too long
-            (word_width, _), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+            (word_width, _), _ = _measure_text(word, font_scale, thickness)
             
             if word_width > max_width:
                 # Word too long, break by character
@@ -105,7 +192,7 @@ def _format_person_info(person_info: PersonInfo) -> list:
                 char_line = ""
                 for char in word:
                     test_char = char_line + char
-                    (char_width, _), _ = cv2.getTextSize(test_char, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+                    (char_width, _), _ = _measure_text(test_char, font_scale, thickness)
                     if char_width <= max_width:
                         char_line = test_char
                     else:
@@ -117,7 +204,7 @@ def _format_person_info(person_info: PersonInfo) -> list:
             
             # Try adding word to current line
             test_line = f"{current_line} {word}".strip() if current_line else word
-            (text_width, _), _ = cv2.getTextSize(test_line, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+            (text_width, _), _ = _measure_text(test_line, font_scale, thickness)
             
             if text_width <= max_width:
                 current_line = test_line
@@ -133,7 +220,8 @@ def _format_person_info(person_info: PersonInfo) -> list:
     
     # Display name (modern header style) with wrapping
     name = person_info.full_name or "Unknown Person"
-    print(f"   → Displaying completed status with name: {name}")
+    if debug:
+        print(f"   → Displaying completed status with name: {name}")
     name_lines = wrap_text_to_width(name.upper(), 0.55, is_bold=True)
     for name_line in name_lines:
         lines.append((name_line, 0.55, True, (255, 255, 255)))
@@ -151,9 +239,10 @@ def _format_person_info(person_info: PersonInfo) -> list:
     lines.append(("", 0.15, False, config.INFO_TEXT_COLOR))  # Small spacer
     
     # Display summary with word wrapping for narrow box
-    # Handle case where summary might be one long line
-    summary_lines = person_info.summary.split('\n') if '\n' in person_info.summary else [person_info.summary]
-    print(f"   → Summary has {len(summary_lines)} lines")
+    # (split returns the whole summary as one line if it has no newlines)
+    summary_lines = person_info.summary.split('\n')
+    if debug:
+        print(f"   → Summary has {len(summary_lines)} lines")
     
     for i, line in enumerate(summary_lines):
         line = line.strip()
@@ -163,34 +252,18 @@ def _format_person_info(person_info: PersonInfo) -> list:
             continue
         
         # Skip lines that look like artifacts (e.g., "Here is...", "Example:", etc.)
-        skip_phrases = [
-            'here is', 'here are', 'here\'s',
-            'example:', 'format:',
-            'given this', 'write', 'rules:',
-            'note:', 'summary:',
-            '...', '...'  # Skip lines with ellipsis
-        ]
-        if any(phrase in line.lower() for phrase in skip_phrases):
-            print(f"      Skipping artifact line: {line[:50]}")
+        lower_line = line.lower()
+        if any(phrase in lower_line for phrase in _SKIP_PHRASES):
+            if debug:
+                print(f"      Skipping artifact line: {line[:50]}")
             continue
         
         # Remove any emojis or bullets that might have slipped through
         # Remove common emoji patterns and bullet points
-        cleaned_line = line
-        for char in ['•', '◦', '▪', '▫', '–', '—', '*', '→', '►']:
-            cleaned_line = cleaned_line.replace(char, '').strip()
+        cleaned_line = line.translate(_STRIP_CHARS_TABLE).strip()
         
-        # Remove emojis (basic removal of common unicode ranges)
-        import re
-        emoji_pattern = re.compile("["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags
-            u"\U00002702-\U000027B0"
-            u"\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE)
-        cleaned_line = emoji_pattern.sub('', cleaned_line).strip()
+        # Remove emojis
+        cleaned_line = _EMOJI_RE.sub('', cleaned_line).strip()
         
         # Skip if line became empty after cleaning
         if not cleaned_line:
@@ -209,7 +282,8 @@ def _format_person_info(person_info: PersonInfo) -> list:
             for wrapped_line in wrapped_lines:
                 lines.append((wrapped_line, font_scale, False, text_color))
         else:
-            print(f"      Line {i}: {cleaned_line[:50]}")
+            if debug:
+                print(f"      Line {i}: {cleaned_line[:50]}")
             # Add link prefix for URLs (no emoji to avoid rendering issues)
             display_text = f"LINK: {cleaned_line}" if is_url else cleaned_line
             # Wrap URLs too in case they're very long
@@ -217,7 +291,8 @@ def _format_person_info(person_info: PersonInfo) -> list:
             for wrapped_url in wrapped_urls:
                 lines.append((wrapped_url, font_scale, False, text_color))
     
-    print(f"   → Total display lines: {len(lines)}")
+    if debug:
+        print(f"   → Total display lines: {len(lines)}")
     return lines
 
 
@@ -238,14 +313,7 @@ def _calculate_box_dimensions(lines: list) -> Tuple[int, int, list]:
     total_height = config.INFO_BOX_PADDING_TOP + 8  # Extra padding for modern look
     line_heights = []
 
-    for line_data in lines:
-        # Handle both old and new tuple formats
-        if len(line_data) == 4:
-            text, font_scale, is_bold, color = line_data
-        else:
-            text, font_scale, is_bold = line_data
-            color = config.INFO_TEXT_COLOR
-
+    for text, font_scale, is_bold, _ in lines:
         if text == "":
             # Empty line
             line_height = int(15 * font_scale)
@@ -254,12 +322,7 @@ def _calculate_box_dimensions(lines: list) -> Tuple[int, int, list]:
             continue
 
         thickness = 2 if is_bold else 1
-        (text_width, text_height), baseline = cv2.getTextSize(
-            text,
-            cv2.FONT_HERSHEY_SIMPLEX,
-            font_scale,
-            thickness
-        )
+        (text_width, text_height), baseline = _measure_text(text, font_scale, thickness)
 
         line_height = text_height + baseline + config.INFO_LINE_SPACING + 2
         line_heights.append(line_height)
@@ -351,6 +414,61 @@ def _calculate_box_position(
     return x, y
 
 
+@lru_cache(maxsize=64)
+def _gradient_row_weights(gradient_height: int, rows: int) -> Tuple[float, np.ndarray]:
+    """
+    Per-row blend weights of the info box background gradient.
+    
+    Args:
+        gradient_height: Number of gradient steps at the top of the box
+        rows: Number of box rows
+    
+    Returns:
+        Tuple of (background weight, (rows, 1, 1) gradient color weights);
+        the frame gets the remaining weight
+    """
+    alphas = np.arange(gradient_height, 0, -1, dtype=np.float64) / max(gradient_height, 1) * 0.3
+    # Weight each step keeps after all later steps: a_i * prod_{j>i}(1 - a_j)
+    keep_after = np.append(np.cumprod((1.0 - alphas)[::-1])[::-1][1:], 1.0)[:gradient_height]
+    step_weights = alphas * keep_after
+    
+    # Step i paints box rows i and i + 1 with the gradient color
+    grad_weights = np.zeros(rows)
+    for offset in (0, 1):
+        n = max(0, min(gradient_height, rows - offset))
+        grad_weights[offset:offset + n] += step_weights[:n]
+    
+    bg_weight = float(np.prod(1.0 - alphas))
+    return bg_weight, grad_weights.astype(np.float32)[:, None, None]
+
+
+@lru_cache(maxsize=64)
+def _background_row_blend(gradient_height: int, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-row frame scale and color offset that draw the info box background.
+    
+    The blended box pixel is frame * scale + offset, combining the dark
+    background, the top gradient and the overall box opacity.
+    
+    Args:
+        gradient_height: Number of gradient steps at the top of the box
+        rows: Number of box rows
+    
+    Returns:
+        Tuple of ((rows, 1, 1) frame scale, (rows, 1, 3) offset incl. rounding)
+    """
+    bg_color = np.array((25, 25, 30), np.float32)  # Very dark gray, almost black
+    grad_color = np.array((50, 50, 60), np.float32)  # Slightly lighter at top
+    alpha = 0.92  # Higher opacity for modern look
+    
+    bg_weight, grad_weights = _gradient_row_weights(gradient_height, rows)
+    frame_weights = 1.0 - bg_weight - grad_weights
+    
+    scale = (alpha * frame_weights + (1 - alpha)).astype(np.float32)
+    offset = (alpha * bg_weight * bg_color + alpha * grad_weights * grad_color + 0.5).astype(np.float32)
+    return scale, offset
+
+
 def _draw_info_box_background(
     frame: np.ndarray,
     x: int,
@@ -366,36 +484,24 @@ def _draw_info_box_background(
         x, y: Top-left corner position
         width, height: Box dimensions
     """
-    # Create overlay for transparency effects
-    overlay = frame.copy()
-
-    # Draw main background with darker color for modern look
-    bg_color = (25, 25, 30)  # Very dark gray, almost black
-    cv2.rectangle(
-        overlay,
-        (x, y),
-        (x + width, y + height),
-        bg_color,
-        -1  # Filled
-    )
-
-    # Add subtle gradient effect at top
-    gradient_height = min(40, height // 3)
-    for i in range(gradient_height):
-        alpha = (gradient_height - i) / gradient_height * 0.3
-        gradient_overlay = frame.copy()
-        cv2.rectangle(
-            gradient_overlay,
-            (x, y + i),
-            (x + width, y + i + 1),
-            (50, 50, 60),  # Slightly lighter at top
-            -1
-        )
-        cv2.addWeighted(gradient_overlay, alpha, overlay, 1 - alpha, 0, overlay)
-
-    # Blend with original frame for transparency
-    alpha = 0.92  # Higher opacity for modern look
-    cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+    # Dark background with a subtle gradient at the top, blended with the
+    # frame for transparency. Each gradient row blends a 2px lighter band
+    # while the rest of the box is blended back towards the frame, so every
+    # box row ends up as a fixed mix of background, gradient and frame;
+    # apply those mixes in one pass over the box area only
+    roi = frame[y:y + height + 1, x:x + width + 1]
+    rows, cols = roi.shape[:2]
+    scale, offset = _background_row_blend(min(40, height // 3), rows)
+
+    buf = getattr(_scratch, 'bg', None)
+    if buf is None or buf.shape[0] < rows or buf.shape[1] < cols:
+        shape = (rows, cols) if buf is None else (max(rows, buf.shape[0]), max(cols, buf.shape[1]))
+        buf = _scratch.bg = np.empty(shape + (3,), np.float32)
+    buf = buf[:rows, :cols]
+
+    np.multiply(roi, scale, out=buf)
+    buf += offset
+    np.copyto(roi, buf, casting='unsafe')
 
     # Draw modern accent border (thin, colored)
     # Top accent line - thicker and colored
@@ -435,50 +541,46 @@ def _draw_text_lines(
     """
     current_y = box_y + config.INFO_BOX_PADDING_TOP + 10  # Extra top padding
 
-    for line_data, line_height in zip(lines, line_heights):
-        # Handle both old and new tuple formats
-        if len(line_data) == 4:
-            text, font_scale, is_bold, color = line_data
-        else:
-            text, font_scale, is_bold = line_data
-            color = config.INFO_TEXT_COLOR
+    # Loop-invariant values and OpenCV names bound once for the per-line loop
+    put_text = cv2.putText
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    line_aa = cv2.LINE_AA
+    line_spacing = config.INFO_LINE_SPACING
+    text_x = box_x + config.INFO_BOX_PADDING_LEFT + 8  # Text position with better padding
 
+    for (text, font_scale, is_bold, color), line_height in zip(lines, line_heights):
         if text == "":
             # Skip empty lines
             current_y += line_height
             continue
 
         thickness = 2 if is_bold else 1
-
-        # Calculate text position with better padding
-        text_x = box_x + config.INFO_BOX_PADDING_LEFT + 8
-        text_y = current_y + line_height - config.INFO_LINE_SPACING
+        text_y = current_y + line_height - line_spacing
 
         # Add subtle shadow effect for better readability
         if is_bold or "EMAIL:" in text:  # Shadow for important text
             shadow_color = (0, 0, 0)  # Black shadow
-            cv2.putText(
+            put_text(
                 frame,
                 text,
                 (text_x + 1, text_y + 1),  # Slight offset for shadow
-                cv2.FONT_HERSHEY_SIMPLEX,
+                font,
                 font_scale,
                 shadow_color,
                 thickness,
-                cv2.LINE_AA
+                line_aa
             )
 
         # Draw main text with specified color
-        cv2.putText(
+        put_text(
             frame,
             text,
             (text_x, text_y),
-            cv2.FONT_HERSHEY_SIMPLEX,
+            font,
             font_scale,
             color,
             thickness,
-            cv2.LINE_AA
+            line_aa
         )
 
         current_y += line_height
-
@@ -309,7 +309,7 @@ class FaceRecognitionApp:
                                     # Send the transcript via iMessage
                                     print(f"\n✌️ Peace sign detected! Sending last {self.imessage_handler.transcript_lookback_seconds}s of transcript...")
                                     if self.imessage_handler.send_transcript(recent_transcript):
-                                        print(f"✅ Transcript sent successfully!")
+                                        print(f"✅ Transcript queued for sending!")
                                     else:
                                         print(f"❌ Failed to send transcript")
                                 else:
@@ -821,11 +821,16 @@ class FaceRecognitionApp:
             print(f"Unique faces detected: {stats['total_unique_faces']}")
             print(f"Total detections: {stats['total_detections']}")
             print(f"Faces saved to: {config.DETECTED_FACES_DIR}")
+            self.face_tracker.close()
         
         # Close gesture detector if enabled
         if self.gesture_detector:
             self.gesture_detector.close()
         
+        # Finish sending any queued iMessages
+        if self.imessage_handler:
+            self.imessage_handler.close()
+        
         # Stop crypto server if enabled
         if self.crypto_handler:
             # Print transaction statistics
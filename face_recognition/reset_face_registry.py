@@ -33,6 +33,10 @@ def reset_registry():
     with open(config.FACE_REGISTRY_FILE, 'w') as f:
         json.dump({}, f, indent=2)
     
+    # Restart person IDs from person_001
+    if os.path.exists(config.FACE_REGISTRY_META_FILE):
+        os.remove(config.FACE_REGISTRY_META_FILE)
+    
     print(f"✅ Registry cleared: {config.FACE_REGISTRY_FILE}")
     print(f"   Previous data backed up to: {backup_path}")
     
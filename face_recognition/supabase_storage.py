@@ -55,7 +55,8 @@ class SupabaseStorage:
     def upload_face_image(
         self,
         file_path: str,
-        storage_path: str
+        storage_path: str,
+        file_data: Optional[bytes] = None
     ) -> Optional[dict]:
         """
         Upload a face image to Supabase storage.
@@ -63,6 +64,7 @@ class SupabaseStorage:
         Args:
             file_path: Local file path to upload
             storage_path: Path in Supabase storage (e.g., "faces/person_001_1729881234.png")
+            file_data: Already-encoded image bytes (skips re-reading file_path)
         
         Returns:
             Upload response dict or None if failed
@@ -71,14 +73,15 @@ class SupabaseStorage:
             print("⚠️  Supabase client not initialized")
             return None
         
-        if not os.path.exists(file_path):
+        if file_data is None and not os.path.exists(file_path):
             print(f"❌ File not found: {file_path}")
             return None
         
         try:
             # Read file
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
+            if file_data is None:
+                with open(file_path, 'rb') as f:
+                    file_data = f.read()
             
             # Upload to Supabase
             response = self.client.storage.from_(self.bucket_name).upload(
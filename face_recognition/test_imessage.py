@@ -14,7 +14,7 @@ def test_basic_send():
 
     # Test sending a simple message
     print("Sending test message...")
-    success = handler.send_imessage("Test message from face recognition system")
+    success = handler.send_imessage_sync("Test message from face recognition system")
 
     if success:
         print("✅ Test 1 passed: Message sent successfully")
@@ -114,7 +114,7 @@ def test_full_flow():
 
     if message_to_send:
         print("\nSending captured message...")
-        success = handler.send_imessage(message_to_send)
+        success = handler.send_imessage_sync(message_to_send)
 
         if success:
             print("✅ Test 4 passed: Full flow completed successfully")
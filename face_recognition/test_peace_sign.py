@@ -14,7 +14,7 @@ def test_basic_imessage():
     test_message = "Test message from peace sign detector"
     print(f"Sending test message: {test_message}")
 
-    success = handler.send_imessage(test_message)
+    success = handler.send_imessage_sync(test_message)
     if success:
         print("✅ Test 1 passed: Message sent successfully")
     else:
@@ -32,7 +32,7 @@ def test_transcript_sending():
     test_transcript = "This is a test transcript. We talked about the meeting tomorrow at 3 PM in the conference room. Don't forget to bring the documents."
 
     print(f"Sending transcript: {test_transcript[:50]}...")
-    success = handler.send_transcript(test_transcript)
+    success = handler.send_transcript_sync(test_transcript)
 
     if success:
         print("✅ Test 2 passed: Transcript sent successfully")
@@ -49,7 +49,7 @@ def test_cooldown():
 
     # First message
     print("Sending first message...")
-    handler.send_imessage("First message")
+    handler.send_imessage_sync("First message")
 
     # Check cooldown immediately
     if not handler.can_send():
@@ -66,7 +66,7 @@ def test_cooldown():
     if handler.can_send():
         print("✅ Can send after cooldown (expected)")
         # Send second message
-        success = handler.send_imessage("Second message after cooldown")
+        success = handler.send_imessage_sync("Second message after cooldown")
         if success:
             print("✅ Test 3 passed: Cooldown works correctly")
             return True
@@ -106,7 +106,7 @@ def test_long_transcript():
     print(f"Original length: {len(long_text)} characters")
     print("Sending long transcript...")
 
-    success = handler.send_transcript(long_text)
+    success = handler.send_transcript_sync(long_text)
 
     if success:
         print("✅ Test 5 passed: Long transcript handled successfully (truncated if needed)")